@@ -28,9 +28,12 @@ bl_info = {
 
 import bpy
 import re
+import sys
+import time
 import traceback
 import mathutils
-import functools
+from heapq import heappop, heappush
+from itertools import compress, repeat
 from bpy.app.handlers import persistent
 # ==============================================================================
 # SECTION 1: CONFIGURATION & CONSTANTS
@@ -38,6 +41,8 @@ from bpy.app.handlers import persistent
 RRUG_TRIGGER_KEY = "RRUG_UI"
 MAX_UI_NESTING = 8
 FIXED_FPS = 4.0
+CACHE_SWEEP_TICKS = 600
+PARSED_CACHE_LIMIT = 8
 
 # 0: RRUG UI, 1: Animation, 2: View, 3: Tool, 4: Item, 5: Constraints
 UI_LOCATION_INDEX = 1 
@@ -76,10 +81,27 @@ FLAG_CONFIG = {
     "INTERNALS": {"params": None, "validator": None},
     "BOARD":     {"params": None, "validator": None},
 }
-_EXPLICIT_NAME_PATTERN = re.compile(r'\{([^}]+)\}(?:\[[^\]]+\])?')
+# Flattened flag rules for the parser loop
+_FLAG_PARAMS = {k: v["params"] for k, v in FLAG_CONFIG.items()}
+_FLAG_VALIDATORS = {k: v["validator"] for k, v in FLAG_CONFIG.items()}
+# Integer bitmask per flag for fast membership tests on hot paths
+_FLAG_BITS = {f: 1 << i for i, f in enumerate(FLAG_CONFIG)}
+F_HIDE = _FLAG_BITS["HIDE"]
+F_SKIP = _FLAG_BITS["SKIP"]
+F_JOIN = _FLAG_BITS["JOIN"]
+F_LINK = _FLAG_BITS["LINK"]
+F_TO = _FLAG_BITS["TO"]
+F_FILTER = _FLAG_BITS["FILTER"]
+F_INLINE = _FLAG_BITS["INLINE"]
+F_BOARD = _FLAG_BITS["BOARD"]
+# Name parsing runs on UTF-8 bytes, every delimiter is ASCII so matches never split a character
+_EXPLICIT_NAME_PATTERN = re.compile(rb'\{([^}]+)\}(?:\[[^\]]+\])?')
 _PROP_ORDER_PATTERN = re.compile(r'^\{\d+\}\s*')
 _FLAG_KEYS = sorted(FLAG_CONFIG.keys(), key=len, reverse=True)
-_FLAG_TUPLE_PATTERN = re.compile(r'\((%s)\)(?:\s*\[([^\]]+)\])?' % "|".join(map(re.escape, _FLAG_KEYS)))
+_FLAG_TUPLE_PATTERN = re.compile(rb'\((%s)\)(?:\s*\[([^\]]+)\])?' % "|".join(map(re.escape, _FLAG_KEYS)).encode("ascii"))
+_CTX_PATTERN = re.compile(r'\((DISPLAYS|SETTINGS|SNAPS|INTERNALS)\)')
+# Ordered by priority, a name carrying several tags takes the first one listed here
+_CTX_TAGS = {"DISPLAYS": CTX_VIS, "SETTINGS": CTX_PROP, "SNAPS": CTX_SNAP, "INTERNALS": CTX_INTERNAL}
 _TIPS = {
     "SNAP":             ("Snap Hierarchy", "Snap source bones to target bones based on hierarchy"),
     "SEL_REPLACE":      ("Replace", "Select bones in this collection (Replace Selection)"),
@@ -114,90 +136,259 @@ _TIPS = {
 
 _rrug_ui_data_cache = {}
 _entrance_gatekeeper_cache = {}
+_coll_cache = {}
+_view3d_area_cache = None
+_lower_name_cache = {}
+_clean_name_cache = {}
+_parse_cache = {}
+_parsed_cache = {}
+_valid_icons_cache = None
+_coll_has_is_solo = None
+_cascade_error_reported = False
+_sweep_countdown = 0
+_swept_armature_count = -1
+_idle_streak = {}
+_last_tick_time = 0.0
+_next_tick_time = 0.0
+# Shared immutable defaults so hot lookups never allocate a throwaway container
+_EMPTY_TUPLE = ()
+# Draw directive tags built from ui_layout rows
+_DRAW_SINGLE = 0
+_DRAW_ROW = 1
+# Deferred task tags for the iterative tree drawers
+_TASK_NODE = 0
+_TASK_OPS = 1
+_TASK_SPLIT = 2
+_TASK_OVERFLOW = 3
+# Operator ids emitted per tree row by the drawers
+_OP_SEL_REPLACE = sys.intern("rrug_ui.select_replace")
+_OP_SEL_ADD = sys.intern("rrug_ui.select_add")
+_OP_VIS_TOGGLE = sys.intern("rrug_ui.vis_toggle")
+_OP_SOLO_TOGGLE = sys.intern("rrug_ui.solo_toggle")
+_OP_RESET = sys.intern("rrug_ui.reset")
+_OP_PROP_SYMMETRIZE = sys.intern("rrug_ui.prop_symmetrize")
+_OP_SNAP_BATCH = sys.intern("rrug_ui.snap_hierarchy_batch")
+_OP_EXPAND_ALL = sys.intern("rrug_ui.expand_all")
+# Snap hierarchy buttons as (icon, snap_loc, snap_rot, snap_scale)
+_SNAP_BTNS = (
+    ('CON_LOCLIKE', True, False, False),
+    ('CON_ROTLIKE', False, True, False),
+    ('CON_SIZELIKE', False, False, True),
+    ('SNAP_ON', True, True, True),
+)
+# Toggle icons indexed by the boolean collection state
+_HIDE_ICONS = ('HIDE_ON', 'HIDE_OFF')
+_SOLO_ICONS = ('SOLO_OFF', 'SOLO_ON')
+# Workflow and cursor snap button rows: (operator value, icon)
+_RESET_BTNS = (('LOC', 'CON_LOCLIKE'), ('ROT', 'CON_ROTLIKE'), ('SCALE', 'CON_SIZELIKE'), ('ALL', 'LOOP_BACK'))
+_CURS_TO_SEL_BTNS = (('CURS_TO_SEL_LOC', 'CON_LOCLIKE'), ('CURS_TO_SEL_ROT', 'CON_ROTLIKE'), ('CURS_TO_SEL_ALL', 'SNAP_ON'))
+_SEL_TO_CURS_BTNS = (('SEL_TO_CURS_LOC', 'CON_LOCLIKE'), ('SEL_TO_CURS_ROT', 'CON_ROTLIKE'), ('SEL_TO_CURS_ALL', 'SNAP_ON'))
+# Cursor snap button groups: (header icon, buttons, trailing gap)
+_CURSOR_SNAP_GROUPS = (('CURSOR', _CURS_TO_SEL_BTNS, 1.0), ('SNAP_PEEL_OBJECT', _SEL_TO_CURS_BTNS, 2.0))
+# Cursor rotation popover rows per mode: (data path, (component index, label) pairs), Euler modes use the default
+_CURSOR_ROT_LAYOUT = {
+    'QUATERNION': ('rotation_quaternion', ((0, "W"), (1, "X"), (2, "Y"), (3, "Z"))),
+    'AXIS_ANGLE': ('rotation_axis_angle', ((0, "W"), (1, "X"), (2, "Y"), (3, "Z"))),
+}
+_CURSOR_ROT_DEFAULT = ('rotation_euler', ((0, "X"), (1, "Y"), (2, "Z")))
+# Cursor snap actions: (cursor follows active bone, transform mask, tooltip)
+_CURSOR_SNAP_ACTIONS = {
+    'CURS_TO_SEL_LOC': (True, (True, False, False), "Snap Cursor Location to Active Bone"),
+    'CURS_TO_SEL_ROT': (True, (False, True, False), "Snap Cursor Rotation to Active Bone"),
+    'CURS_TO_SEL_ALL': (True, (True, True, False), "Snap Cursor to Active Bone (Loc & Rot)"),
+    'SEL_TO_CURS_LOC': (False, (True, False, False), _TIPS["SNAP_SEL_TO_CURS_LOC"][1]),
+    'SEL_TO_CURS_ROT': (False, (False, True, False), _TIPS["SNAP_SEL_TO_CURS_ROT"][1]),
+    'SEL_TO_CURS_ALL': (False, (True, True, False), _TIPS["SNAP_SEL_TO_CURS_ALL"][1]),
+}
 _DEFAULT_RRUG_UI_DATA = {
     "node_map": {}, "vis_display": [], "snap_groups": {}, "snap_layout": [],
-    "props_others": [], "has_links": False, "found_settings": False,
-    "root_collection_names": []
+    "props_others": [], "link_pairs": [], "has_links": False, "found_settings": False,
+    "root_collection_names": [], "_vis_index": ((), ()), "_prop_index": ((), ()), "_snap_index": ((), ())
 }
 
 # ==============================================================================
 # SECTION 2: UTILITIES & MATH
 # ==============================================================================
 
-@functools.lru_cache(maxsize=1)
 def _get_valid_blender_icons():
+    global _valid_icons_cache
+    # Icons depend only on the Blender build, so the set survives cache purges and file loads
+    if _valid_icons_cache: return _valid_icons_cache
     try:
         items = bpy.types.UILayout.bl_rna.functions["prop"].parameters["icon"].enum_items
-        return set(items.keys())
+        icons = frozenset(items.keys())
     except (AttributeError, KeyError, TypeError):
-        return set()
+        return frozenset()
+    # Never keep an empty result so a failed early lookup is retried
+    if icons: _valid_icons_cache = icons
+    return icons
 
 def purge_rrug_cache():
     _rrug_ui_data_cache.clear()
     _entrance_gatekeeper_cache.clear()
-    _parse_collection_name.cache_clear()
-    _get_valid_blender_icons.cache_clear()
+    _coll_cache.clear()
+    _lower_name_cache.clear()
+    _clean_name_cache.clear()
+    _parse_cache.clear()
+    _parsed_cache.clear()
+    _idle_streak.clear()
     print("RRUG UI: Cache Flushed")
 
 @persistent
 def rrug_ui_load_handler(dummy):
+    global _view3d_area_cache
     purge_rrug_cache()
+    _view3d_area_cache = None
+
+@persistent
+def rrug_ui_depsgraph_handler(scene, depsgraph):
+    global _next_tick_time
+    # User activity cancels the idle backoff, the next tick lands at most one base interval after the last one
+    if _idle_streak:
+        _idle_streak.clear()
+        base_interval = 1.0 / FIXED_FPS
+        if _next_tick_time - _last_tick_time > base_interval and bpy.app.timers.is_registered(rrug_ui_timer_update):
+            bpy.app.timers.unregister(rrug_ui_timer_update)
+            first_interval = max(0.0, _last_tick_time + base_interval - time.monotonic())
+            bpy.app.timers.register(rrug_ui_timer_update, first_interval=first_interval, persistent=True)
+            _next_tick_time = _last_tick_time + base_interval
+    # Bone assignment and custom property edits do not change the gatekeeper state, drop stale search indices
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if not isinstance(id_data, bpy.types.Armature): continue
+        # Collections may have been deleted or renamed without an undo step, drop their references before any search callback
+        _coll_cache.clear()
+        ui_data = _rrug_ui_data_cache.get(id_data.as_pointer())
+        if not ui_data: continue
+        for key in ("_vis_index", "_prop_index", "_snap_index", "_bone_corpus", "_key_corpus"): ui_data.pop(key, None)
+
+@persistent
+def rrug_ui_undo_handler(dummy):
+    # Undo/Redo rebuilds RNA data, drop references so no stale pointer is handed out
+    _coll_cache.clear()
+
+def lower_name(text):
+    # Memoize lowercase forms of bone names, keys and labels across index rebuilds
+    low = _lower_name_cache.get(text)
+    if low is None: low = _lower_name_cache[text] = text.lower()
+    return low
+
+def clean_prop_name(key):
+    # Memoize property display names with the {01} ordering prefix stripped
+    clean = _clean_name_cache.get(key)
+    if clean is None: clean = _clean_name_cache[key] = _PROP_ORDER_PATTERN.sub("", key)
+    return clean
 
 def is_in_pose_mode(context):
     return context.mode == 'POSE'
 
 def get_3d_view_area(context):
-    for window in context.window_manager.windows:
+    global _view3d_area_cache
+    windows = context.window_manager.windows
+    # Reuse the cached pair only if it still belongs to a live screen, compare before dereferencing
+    if _view3d_area_cache:
+        c_win, c_area = _view3d_area_cache
+        for window in windows:
+            if window != c_win: continue
+            if window.screen and any(area == c_area for area in window.screen.areas):
+                if c_area.type == 'VIEW_3D': return c_win, c_area
+            break
+    # Rescan all windows on layout change
+    _view3d_area_cache = None
+    for window in windows:
+        if not window.screen: continue
         for area in window.screen.areas:
-            if area.type == 'VIEW_3D': return window, area
+            if area.type == 'VIEW_3D':
+                _view3d_area_cache = (window, area)
+                return window, area
     return None, None
 
-def limited_redraw():
+def _flush_redraw():
+    # Tag target areas once for all redraw requests made since the last event loop pass
     try: wm = bpy.context.window_manager
-    except AttributeError: return
-    if not wm: return
-    target_areas = {'VIEW_3D', UI_SPACE_TYPE}
+    except AttributeError: return None
+    if not wm: return None
     for window in wm.windows:
         if not window.screen: continue
         for area in window.screen.areas:
-            if area.type in target_areas: area.tag_redraw()
+            # Only the panel region needs to redraw, collection edits notify the viewport themselves
+            if area.type != UI_SPACE_TYPE: continue
+            for region in area.regions:
+                if region.type == UI_REGION_TYPE: region.tag_redraw()
+    return None
+
+def limited_redraw():
+    # Coalesce repeated requests, the timer registration itself acts as the pending flag
+    # No update= dirty flag, the timer only calls this on scanner hash changes and those include edits made outside RRUG
+    if bpy.app.timers.is_registered(_flush_redraw): return
+    bpy.app.timers.register(_flush_redraw, first_interval=0.0)
 
 def safe_get_collection(armature, collection_name):
     if not armature or not collection_name: return None
-    return armature.collections_all.get(collection_name)
+    # Reuse lookups within the current UI frame, misses are never cached
+    key = (armature.as_pointer(), collection_name)
+    coll = _coll_cache.get(key)
+    if coll is None:
+        coll = armature.collections_all.get(collection_name)
+        if coll is not None: _coll_cache[key] = coll
+    return coll
+
+def resolve_collections(armature, names):
+    # Resolve many names with one pass over collections_all, name lookups on the RNA collection are linear
+    by_name = {c.name: c for c in armature.collections_all}
+    return {name: by_name[name] for name in names if name in by_name}
 
 if bpy.app.version >= (5, 0, 0):
     def select_bone(arm_obj, data_bone):
         if pb := arm_obj.pose.bones.get(data_bone.name): pb.select = True
+    def set_pose_bone_select(pose_bone, state):
+        pose_bone.select = state
 else:
     def select_bone(arm_obj, data_bone):
         data_bone.select = True
+    def set_pose_bone_select(pose_bone, state):
+        pose_bone.bone.select = state
 
 def get_composed_matrix(source_matrix, target_matrix, snap_mode):
+    # Skip decompose/recompose when every channel comes from one side
+    if all(snap_mode): return target_matrix.copy()
+    if not any(snap_mode): return source_matrix.copy()
+    return compose_matrix_parts(source_matrix, target_matrix.decompose(), snap_mode)
+
+def compose_matrix_parts(source_matrix, target_parts, snap_mode):
+    # Recompose against an already decomposed target so one target can serve many sources
     loc_s, rot_s, scl_s = source_matrix.decompose()
-    loc_t, rot_t, scl_t = target_matrix.decompose()
+    loc_t, rot_t, scl_t = target_parts
     final_loc = loc_t if snap_mode[0] else loc_s
     final_rot = rot_t if snap_mode[1] else rot_s
     final_scl = scl_t if snap_mode[2] else scl_s
     return mathutils.Matrix.LocRotScale(final_loc, final_rot, final_scl)
 
+# Rotation channel data path and restore key per rotation mode, Euler orders share the default
+_ROT_PATH = {'QUATERNION': ('rotation_quaternion', 'rot_q'), 'AXIS_ANGLE': ('rotation_axis_angle', 'rot_a')}
+_ROT_DEFAULT = ('rotation_euler', 'rot_e')
+# Relative per-element drift at which a re-evaluated snap matrix counts as settled, floored at one unit
+_SNAP_SETTLE_EPSILON = 1e-6
+
+def matrices_close(matrix_a, matrix_b):
+    # Compare element-wise relative to magnitude, float32 round-off on far translations exceeds any absolute bound
+    for row_a, row_b in zip(matrix_a, matrix_b):
+        for a, b in zip(row_a, row_b):
+            if abs(a - b) > _SNAP_SETTLE_EPSILON * max(1.0, abs(a), abs(b)): return False
+    return True
+
 def apply_keyframes(pose_bone, snap_mode):
     snap_loc, snap_rot, snap_scale = snap_mode
     if snap_loc: pose_bone.keyframe_insert(data_path="location")
-    if snap_rot:
-        mode = pose_bone.rotation_mode
-        path = "rotation_quaternion" if mode == 'QUATERNION' else "rotation_axis_angle" if mode == 'AXIS_ANGLE' else "rotation_euler"
-        pose_bone.keyframe_insert(data_path=path)
+    if snap_rot: pose_bone.keyframe_insert(data_path=_ROT_PATH.get(pose_bone.rotation_mode, _ROT_DEFAULT)[0])
     if snap_scale: pose_bone.keyframe_insert(data_path="scale")
 
 def restore_mirror_channels(pose_bone, original_data, snap_mode):
     snap_loc, snap_rot, snap_scale = snap_mode
     if not snap_loc: pose_bone.location = original_data.get('loc', pose_bone.location)
     if not snap_rot:
-        mode = pose_bone.rotation_mode
-        if mode == 'QUATERNION': pose_bone.rotation_quaternion = original_data.get('rot_q', pose_bone.rotation_quaternion)
-        elif mode == 'AXIS_ANGLE': pose_bone.rotation_axis_angle = original_data.get('rot_a', pose_bone.rotation_axis_angle)
-        else: pose_bone.rotation_euler = original_data.get('rot_e', pose_bone.rotation_euler)
+        path, key = _ROT_PATH.get(pose_bone.rotation_mode, _ROT_DEFAULT)
+        setattr(pose_bone, path, original_data.get(key, getattr(pose_bone, path)))
     if not snap_scale: pose_bone.scale = original_data.get('scl', pose_bone.scale)
 
 # ==============================================================================
@@ -216,213 +407,158 @@ def _update_prop_search(self, context):
 def _update_snap_search(self, context):
     _clean_search_suffix(self, context, "rrug_snap_search")
 
-def _get_vis_candidates(self, context, edit_text):
-    # Verify active object is an armature
-    obj = context.object
-    if not obj or obj.type != 'ARMATURE': return []
-    # Retrieve UI structure from cache
-    ui_data = update_and_get_master_tree_data(obj.data)
-    nm = ui_data.get("node_map", {})
-    roots = ui_data.get("root_collection_names", [])
-    query = edit_text.lower()
-    allowed_bones = set()
-    # Recursive helper to harvest bones from visibility branches
-    def harvest_bones(node_id):
-        node = nm.get(node_id)
-        if not node: return
-        # Check FILTER logic
-        # Default to including bones unless restricted
-        include_bones = True
-        active_flags = node.get("active_flags", set())
-        if "FILTER" in active_flags:
-            # Retrieve parameter for FILTER flag from flag_list
-            f_param = next((p for f, p in node.get("flag_list", []) if f == "FILTER"), None)
-            # (FILTER) -> Always exclude from search (handles None and empty string "")
-            if not f_param:
-                include_bones = False
-            # (FILTER)[IFHIDDEN] -> Exclude only if collection is hidden
-            elif f_param == "IFHIDDEN":
-                if not node.get("is_visible", True):
-                    include_bones = False
-        # Access the collection and add its bones to the allowed set if allowed
-        coll = safe_get_collection(obj.data, node_id)
-        if coll and include_bones:
-            for b in coll.bones:
-                allowed_bones.add(b.name)
-        # Continue traversal through children
-        for child_id in node.get("children", []):
-            harvest_bones(child_id)
-    # Initiate harvesting only for roots belonging to the DISPLAYS context
-    for r_name in roots:
-        root_node = nm.get(r_name)
-        if root_node and root_node.get("tree_type") == CTX_VIS:
-            harvest_bones(r_name)
-    # Filter armature bones based on query and visibility membership
-    candidates = [
-        b.name for b in obj.data.bones 
-        if b.name in allowed_bones and query in b.name.lower()
-    ]
+def _scan_search_index(armature, index_key, edit_text):
+    # Retrieve a flat search index, rebuilding it if a depsgraph update dropped it
+    ui_data = update_and_get_master_tree_data(armature)
+    if index_key not in ui_data:
+        if not ui_data.get("node_map"): return []
+        _helper_build_search_index(armature, ui_data)
+    names, haystacks = ui_data[index_key]
+    # Single C-level pass: names and lowercase haystacks are parallel, pre-sorted tuples
+    matches = compress(names, map(str.__contains__, haystacks, repeat(edit_text.lower())))
+    return list(dict.fromkeys(matches))
 
-    return sorted(candidates)
+def _get_vis_candidates(self, context, edit_text):
+    # Search callbacks run on the owning Armature, so no context or object lookup is needed
+    return _scan_search_index(self, "_vis_index", edit_text)
 
 def _get_prop_candidates(self, context, edit_text):
-    obj = context.object
-    if not obj or obj.type != 'ARMATURE': return []
-    ui_data = update_and_get_master_tree_data(obj.data)
-    nm = ui_data.get("node_map", {})
-    query = edit_text.lower()
-    candidates = set()
-    def recurse(layout_list):
-        for item in layout_list:
-            if isinstance(item, str):
-                node = nm.get(item)
-                coll = safe_get_collection(obj.data, item)
-                # Verify node metadata and collection existence
-                if node and coll:
-                    col_label = node.get('label', item)
-                    # Iterate through custom properties excluding RNA metadata
-                    for k in coll.keys():
-                        if k != "_RNA_UI":
-                            # Apply the regex to clean the key for the search list
-                            clean_k = _PROP_ORDER_PATTERN.sub("", k)
-                            # Match query against the CLEAN key (or label)
-                            if query in clean_k.lower() or query in col_label.lower():
-                                # Format display string using the CLEAN key
-                                display = f"{clean_k} ({col_label})"
-                                candidates.add(display)
-                # Cascade search through nested layouts
-                if node and node.get("ui_layout"): recurse(node["ui_layout"])
-            elif isinstance(item, list):
-                recurse(item)
-    # Initiate recursive scan from properties root
-    recurse(ui_data.get("props_others", []))
-
-    return sorted(list(candidates))
+    # Match query against the clean key or the collection label
+    return _scan_search_index(self, "_prop_index", edit_text)
 
 def _get_snap_candidates(self, context, edit_text):
-    obj = context.object
-    if not obj or obj.type != 'ARMATURE': return []
-    ui_data = update_and_get_master_tree_data(obj.data)
-    nm = ui_data.get("node_map", {})
-    query = edit_text.lower()
-    candidates = set()
-    def recurse(layout_list):
-        for item in layout_list:
-            if isinstance(item, str):
-                node = nm.get(item)
-                # Check for snap group flag on the current node
-                if node and node.get("is_snap_group"):
-                    label = node.get('label', item)
-                    parent_id = node.get("parent")
-                    parent_label = "Root"
-                    # Resolve parent label to display the containing folder
-                    if parent_id and parent_id in nm:
-                        parent_label = nm[parent_id].get("label", parent_id)
-                    # Match query against snap group label or parent collection label
-                    if query in label.lower() or query in parent_label.lower():
-                        # Format entry as 'Group Name (Folder Name)' for the search menu
-                        display = f"{label} ({parent_label})"
-                        candidates.add(display)
-                # Recursively scan child layouts
-                if node and node.get("ui_layout"): recurse(node["ui_layout"])
-            elif isinstance(item, list):
-                recurse(item)
-    # Initialize traversal from the snapping layout root
-    recurse(ui_data.get("snap_layout", []))
-    
+    # Match query against snap group label or parent collection label
+    return _scan_search_index(self, "_snap_index", edit_text)
 
-    return sorted(list(candidates))
+def _resolve_tree_context(name):
+    # Resolve the context tag by priority rather than by position in the name
+    found = _CTX_PATTERN.findall(name)
+    if not found: return None
+    for tag, ctx in _CTX_TAGS.items():
+        if tag in found: return ctx
 
 def run_structure_scanner(armature, start_collection=None, ignore_skip=False):
     # Initialize data structures for node mapping and traversal tracking
     node_map = {}
     roots = []
     traversal_order = []
+    structure_records = []
+    state_bits = bytearray()
     stack = []
+    arm_key = armature.as_pointer()
     # Define entry point: use specific collection or identify root collections from armature
     if start_collection:
         stack.append((start_collection, None, 0, None)) 
     else:
         # Scan top-level collections and assign UI context based on naming tags
-        for c in reversed(armature.collections):
+        for c in list(armature.collections)[::-1]:
             if c.parent is None:
-                ctx = None
-                n = c.name
-                if "(DISPLAYS)" in n: ctx = CTX_VIS
-                elif "(SETTINGS)" in n: ctx = CTX_PROP
-                elif "(SNAPS)" in n: ctx = CTX_SNAP
-                elif "(INTERNALS)" in n: ctx = CTX_INTERNAL
-                stack.append((c, None, 0, ctx))
+                stack.append((c, None, 0, _resolve_tree_context(c.name)))
     # Execute depth-first traversal of the collection hierarchy
     while stack:
         b_coll, parent_id, depth, tree_ctx = stack.pop()
-        raw_name = b_coll.name
+        # Intern the name once, every later key, parent and children reference shares this object
+        raw_name = sys.intern(b_coll.name)
+        is_visible = b_coll.is_visible
+        is_solo = b_coll.is_solo
         traversal_order.append(raw_name)
+        # Seed the lookup cache with the reference we already hold
+        _coll_cache[(arm_key, raw_name)] = b_coll
         # Inherit tree context from naming conventions
-        if tree_ctx is None:
-             if "(DISPLAYS)" in raw_name: tree_ctx = CTX_VIS
-             elif "(SETTINGS)" in raw_name: tree_ctx = CTX_PROP
-             elif "(SNAPS)" in raw_name: tree_ctx = CTX_SNAP
-             elif "(INTERNALS)" in raw_name: tree_ctx = CTX_INTERNAL
+        if tree_ctx is None: tree_ctx = _resolve_tree_context(raw_name)
+        # Parents are always popped before their children, so one lookup resolves the parent node
+        parent_node = node_map.get(parent_id) if parent_id else None
         # Construct node metadata dictionary for the engine
         node = {
             "name": raw_name,
             "parent": parent_id,
+            "parent_ref": parent_node,
             "children": [],
-            "is_visible": b_coll.is_visible,
-            "is_solo": b_coll.is_solo,
+            "is_visible": is_visible,
+            "is_solo": is_solo,
             "label": raw_name,
-            "active_flags": set(),
+            "flag_mask": 0,
+            "flag_params": {},
+            "hide_flag": False,
             "flag_list": [],
             "icon_name": None,
             "is_valid": True,
             "ui_layout": [],
             "link_meta": None,
+            "is_snap_group": False,
+            "overflow": False,
             "tree_type": tree_ctx
         }
         node_map[raw_name] = node
         # Link node to parent or register as a root node
         if parent_id:
-            if parent_id in node_map: node_map[parent_id]["children"].append(raw_name)
+            if parent_node: parent_node["children"].append(raw_name)
         else:
             roots.append(raw_name)
         # Enforce filtering for skipped nodes or internal engine data
-        if not ignore_skip and "(SKIP)" in raw_name: continue
-        if not ignore_skip and tree_ctx == CTX_INTERNAL: continue
-        # Recursively add children to stack until maximum nesting limit is reached
-        if depth < MAX_UI_NESTING:
-            for child in reversed(b_coll.children):
-                stack.append((child, raw_name, depth + 1, tree_ctx))
-        elif len(b_coll.children) > 0:
-            # Mark node if hierarchy exceed recursion depth limits
-            node["overflow"] = True
+        overflow = False
+        if ignore_skip or ("(SKIP)" not in raw_name and tree_ctx != CTX_INTERNAL):
+            # Recursively add children to stack until maximum nesting limit is reached
+            children = list(b_coll.children)
+            if depth < MAX_UI_NESTING:
+                child_depth = depth + 1
+                stack.extend([(child, raw_name, child_depth, tree_ctx) for child in children[::-1]])
+            elif children:
+                # Mark node if hierarchy exceed recursion depth limits
+                node["overflow"] = overflow = True
+        # Fingerprint the gatekeeper-relevant state of this node
+        node["record_hash"] = hash((raw_name, is_visible, is_solo, parent_id, overflow))
+        # Split the gatekeeper inputs into layout structure and live solo/visibility state
+        structure_records.append((raw_name, parent_id, overflow))
+        state_bits.append(is_visible | is_solo << 1)
+
+    # Fold pre-order descendant lists bottom-up, children are always resolved before their parent
+    for raw_name in reversed(traversal_order):
+        node = node_map[raw_name]
+        descendants = []
+        for child_name in node["children"]:
+            descendants.append(child_name)
+            descendants.extend(node_map[child_name]["descendants"])
+        node["descendants"] = descendants
 
     return {
         "node_map": node_map,
         "root_collection_names": roots,
-        "traversal_order": traversal_order
+        "traversal_order": traversal_order,
+        # Order-sensitive fingerprints of the whole scan, sibling reordering changes the structure one
+        "structure_hash": hash(tuple(structure_records)),
+        "state_hash": hash(bytes(state_bits))
     }
 
-@functools.lru_cache(maxsize=1024)
 def _parse_collection_name(raw_name):
+    # Names are bounded by the rig, a plain dict memo is enough
+    cached = _parse_cache.get(raw_name)
+    if cached is not None: return cached
     # Initialize parser state and result variables
     valid = True
     err = None
     clean = ""
     flags = []
-    active = set()
+    params = {}
+    mask = 0
     icon = None
-    remain = raw_name
+    remain = raw_name.encode("utf-8", "surrogateescape")
     # Extract explicit display name using curly brace pattern
     m = _EXPLICIT_NAME_PATTERN.search(remain)
     if m:
-        clean = m.group(1).strip()
-        remain = remain.replace(m.group(0), "")
-    # Find all flag tuples and remove them from the remaining string
-    tuples = _FLAG_TUPLE_PATTERN.findall(remain)
-    remain = _FLAG_TUPLE_PATTERN.sub("", remain)
+        clean = m.group(1).decode("utf-8", "surrogateescape").strip()
+        remain = remain.replace(m.group(0), b"")
+    # Collect flag tuples and the text between them in a single pass
+    tuples = []
+    leftover_parts = []
+    pos = 0
+    for m in _FLAG_TUPLE_PATTERN.finditer(remain):
+        tuples.append((m.group(1).decode("ascii"), (m.group(2) or b"").decode("utf-8", "surrogateescape")))
+        leftover_parts.append(remain[pos:m.start()])
+        pos = m.end()
+    leftover_parts.append(remain[pos:])
     # Validate that no unrecognized characters remain in the string
-    leftover = remain.strip()
+    leftover = b"".join(leftover_parts).decode("utf-8", "surrogateescape").strip()
     if leftover:
         valid = False
         err = f"SYNTAX ERROR: {leftover}"
@@ -430,15 +566,14 @@ def _parse_collection_name(raw_name):
     # Process extracted flags and validate parameters
     for f, p in tuples:
         f = f.strip()
-        rules = FLAG_CONFIG.get(f)
-        if not rules: continue
+        if f not in _FLAG_PARAMS: continue
         # Normalize parameter strings and strip quotes
         if p:
             p = p.strip()
             if p.startswith("'") and p.endswith("'"): p = p[1:-1]
             else: p = p.upper()
         # Check parameter counts and allowed values
-        c, msg = rules["params"], None
+        c, validator, msg = _FLAG_PARAMS[f], _FLAG_VALIDATORS[f], None
         if c is None and p:
             msg = f"SYNTAX ERROR: {f} takes no parameters"
         elif p and isinstance(c, (set, str)):
@@ -446,26 +581,36 @@ def _parse_collection_name(raw_name):
             if not is_dyn and not ((p in c) if isinstance(c, set) else (p == c)):
                 msg = f"SYNTAX ERROR: '{p}' is not valid for {f}"
         # Execute secondary validation rules if defined
-        if not msg and rules["validator"]:
+        if not msg and validator:
             if not p: msg = f"SYNTAX ERROR: {f} missing parameter"
-            elif not rules["validator"](p):
+            elif not validator(p):
                 msg = f"SYNTAX ERROR: '{p}' invalid"
                 if f == "ICON": icon = 'ERROR'
-        # Update active flags and resolved icon state
-        active.add(f)
+        # Update the flag bitmask and resolved icon state
+        mask |= _FLAG_BITS[f]
         flags.append((f, p))
+        # Keep the first parameter of a repeated flag
+        params.setdefault(f, p)
         if msg:
             valid = False
             err = msg
         else:
             if f == "ICON": icon = p
 
-    return {"id": raw_name, "clean_name": clean, "flag_list": flags, "active_flags": active,
-            "icon_name": icon, "is_valid": valid, "error_msg": err}
+    result = {"id": raw_name, "clean_name": clean, "flag_list": flags, "flag_params": params,
+              "flag_mask": mask, "icon_name": icon, "is_valid": valid, "error_msg": err}
+    _parse_cache[raw_name] = result
+    return result
 
-def run_data_parsing(scan_result):
+def run_data_parsing(scan_result, cached_fields=None):
     # Retrieve the node map from the initial scan results
     nm = scan_result.get("node_map", {})
+    # Reuse the parsed fields of an identical structure, they line up with the traversal order
+    if cached_fields is not None and len(cached_fields) == len(nm):
+        for node, fields in zip(nm.values(), cached_fields): node.update(fields)
+        scan_result["parsed_fields"] = cached_fields
+        return scan_result
+    parsed_fields = []
     # Iterate through every scanned collection to extract metadata
     for raw_name, node in nm.items():
         # Execute the regex-based name parser for each collection
@@ -473,14 +618,19 @@ def run_data_parsing(scan_result):
         # Determine the display label: use the error message if parsing failed, otherwise use the clean name
         final_label = parsed["error_msg"] if not parsed["is_valid"] else parsed["clean_name"]
         # Update the node dictionary with validated flags, icons, and labels
-        node.update({
+        fields = {
             "label": final_label,
             "flag_list": parsed["flag_list"],
-            "active_flags": parsed["active_flags"],
+            "flag_mask": parsed["flag_mask"],
+            "flag_params": parsed["flag_params"],
+            "hide_flag": bool(parsed["flag_mask"] & F_HIDE),
             "icon_name": parsed["icon_name"],
             "is_valid": parsed["is_valid"]
-        })
+        }
+        node.update(fields)
+        parsed_fields.append(fields)
 
+    scan_result["parsed_fields"] = parsed_fields
     return scan_result
 
 def _helper_generate_clean_layout(node_names, node_map):
@@ -491,9 +641,9 @@ def _helper_generate_clean_layout(node_names, node_map):
     for name in node_names:
         # Add the current node to the row buffer
         current_row_buffer.append(name)
-        node = node_map.get(name, {})
         # Check if the node lacks a JOIN flag, signaling the end of the current row
-        if "JOIN" not in node.get("active_flags", set()):
+        # Names always come from the scanner, so the node is guaranteed to exist
+        if not node_map[name]["flag_mask"] & F_JOIN:
             # Commit the buffer to the layout rows and reset the buffer
             layout_rows.append(current_row_buffer)
             current_row_buffer = []
@@ -502,48 +652,128 @@ def _helper_generate_clean_layout(node_names, node_map):
  
     return layout_rows
 
+def _helper_build_draw_ops(layout_rows):
+    # Flatten layout rows into draw directives, split factors are resolved here instead of on every redraw
+    ops = []
+    for row in layout_rows:
+        n = len(row)
+        if n == 1: ops.append((_DRAW_SINGLE, row[0], None))
+        elif n: ops.append((_DRAW_ROW, tuple(row), tuple(1.0 / (n - j) for j in range(n))))
+    return tuple(ops)
+
 def _helper_resolve_links(node_names, node_map):
-    # Initialize index for sequential traversal of node names
-    i = 0
-    # Iterate through the list to establish partner links between adjacent nodes
-    while i < len(node_names):
-        curr_name = node_names[i]
-        curr_node = node_map.get(curr_name)
-        # Skip iteration if the current node metadata is missing
-        if not curr_node: i += 1; continue
+    # Iterate through adjacent pairs to establish partner links between nodes
+    for curr_name, next_name in zip(node_names, node_names[1:]):
+        curr_node = node_map[curr_name]
         # Check for the presence of a LINK flag on the current node
-        has_link_request = "LINK" in curr_node.get("active_flags", set())
-        # Verify link eligibility by checking for a subsequent node in the list
-        if has_link_request and i + 1 < len(node_names):
-            next_name = node_names[i + 1]
-            next_node = node_map.get(next_name)
-            # Establish bidirectional link metadata if the next node exists
-            if next_node:
-                # Assign the next node as the partner and mark current as the source
-                curr_node["link_meta"] = {"partner": next_name, "is_source": True}
-                # Assign the current node as the partner for the next node
-                next_node["link_meta"] = {"partner": curr_name, "is_source": False}
-        # Move to the next index in the sequence
-        i += 1
-
-def run_ui_data_preparation(scan_result):
+        if not curr_node["flag_mask"] & F_LINK: continue
+        # Assign the next node as the partner and mark current as the source
+        curr_node["link_meta"] = {"partner": next_name, "is_source": True}
+        # Assign the current node as the partner for the next node
+        node_map[next_name]["link_meta"] = {"partner": curr_name, "is_source": False}
+
+def _helper_build_search_index(armature, data):
+    # Flatten the finished trees into search indices so candidate callbacks avoid recursion per keystroke
+    nm = data.get("node_map", {})
+    # Harvest bones from visibility branches, honoring FILTER logic
+    allowed_bones = set()
+    stack = [r for r in data.get("root_collection_names", []) if nm[r]["tree_type"] == CTX_VIS]
+    while stack:
+        node_id = stack.pop()
+        node = nm[node_id]
+        # Default to including bones unless restricted
+        include_bones = True
+        if node["flag_mask"] & F_FILTER:
+            f_param = node["flag_params"].get("FILTER")
+            # (FILTER) -> Always exclude from search (handles None and empty string "")
+            if not f_param: include_bones = False
+            # (FILTER)[IFHIDDEN] -> Exclude only if collection is hidden
+            elif f_param == "IFHIDDEN" and not node["is_visible"]: include_bones = False
+        coll = safe_get_collection(armature, node_id)
+        if coll and include_bones:
+            for b in coll.bones: allowed_bones.add(b.name)
+        stack.extend(node["children"])
+    names = tuple(sorted(allowed_bones))
+    data["_vis_index"] = (names, tuple(map(lower_name, names)))
+    # Collect (display, haystack) entries from the properties layout, the newline keeps key and label apart
+    prop_index = []
+    stack = [data.get("props_others", [])]
+    while stack:
+        for item in stack.pop():
+            if isinstance(item, list): stack.append(item); continue
+            node = nm[item]
+            coll = safe_get_collection(armature, item)
+            if coll:
+                col_label = node["label"]
+                label_low = lower_name(col_label)
+                # Iterate through custom properties excluding RNA metadata
+                for k in coll.keys():
+                    if k == "_RNA_UI": continue
+                    clean_k = clean_prop_name(k)
+                    prop_index.append((f"{clean_k} ({col_label})", f"{lower_name(clean_k)}\n{label_low}"))
+            if node["ui_layout"]: stack.append(node["ui_layout"])
+    prop_index.sort(key=lambda e: e[0])
+    data["_prop_index"] = (tuple(e[0] for e in prop_index), tuple(e[1] for e in prop_index))
+    # Collect (display, haystack) entries for snap groups from label and parent label
+    snap_index = []
+    stack = [data.get("snap_layout", [])]
+    while stack:
+        for item in stack.pop():
+            if isinstance(item, list): stack.append(item); continue
+            node = nm[item]
+            if node.get("is_snap_group"):
+                label = node["label"]
+                parent_node = node["parent_ref"]
+                # Resolve parent label to display the containing folder
+                parent_label = parent_node["label"] if parent_node else "Root"
+                snap_index.append((f"{label} ({parent_label})", f"{lower_name(label)}\n{lower_name(parent_label)}"))
+            if node["ui_layout"]: stack.append(node["ui_layout"])
+    snap_index.sort(key=lambda e: e[0])
+    data["_snap_index"] = (tuple(e[0] for e in snap_index), tuple(e[1] for e in snap_index))
+
+def _helper_prop_key_entries(raw_keys):
+    # Keep (data path, display, haystack) in key order, the newline keeps raw and clean forms apart
+    entries = []
+    for k in raw_keys:
+        if k == "_RNA_UI": continue
+        clean_k = clean_prop_name(k)
+        entries.append((f'["{k}"]', clean_k, f"{lower_name(k)}\n{lower_name(clean_k)}"))
+    return tuple(entries)
+
+def _get_filter_corpus(armature, ui_data, corpus_key):
+    # Retrieve per-collection lowercase corpora for the filtered drawers, rebuilt lazily after a depsgraph drop
+    corpus = ui_data.get(corpus_key)
+    if corpus is not None: return corpus
+    corpus = {}
+    nm = ui_data.get("node_map")
+    if not nm: return corpus
+    for node_id in nm:
+        coll = safe_get_collection(armature, node_id)
+        if not coll: continue
+        if corpus_key == "_bone_corpus":
+            # Join bone names with a unit separator so a single substring test covers the collection
+            corpus[node_id] = "\x1f".join([lower_name(b.name) for b in coll.bones])
+        else:
+            # Pair the entries with the raw keys they were built from
+            raw_keys = tuple(coll.keys())
+            corpus[node_id] = (raw_keys, _helper_prop_key_entries(raw_keys))
+    ui_data[corpus_key] = corpus
+    return corpus
+
+def run_ui_data_preparation(scan_result, armature=None):
     # Initialize the target data structure for the UI engine
     nm = scan_result.get("node_map", {})
     roots = scan_result.get("root_collection_names", [])
     data = {
         "vis_display": [], "snap_groups": {}, "snap_layout": [],
-        "props_others": [], "has_links": False, "found_settings": False
+        "props_others": [], "link_pairs": [], "has_links": False, "found_settings": False
     }
 
-    def is_ui_visible(node_id):
-        # Determine if a collection should be rendered in the UI based on visibility flags
-        node = nm.get(node_id)
-        if not node: return False
-        # Check if the HIDE flag is active while the collection is hidden
-        if "HIDE" in node["active_flags"] and not node["is_visible"]: return False
-        # Exclude nodes explicitly marked with the SKIP flag
-        if "SKIP" in node["active_flags"]: return False
-        return True
+    # Precompute render visibility once, states do not change during a preparation pass
+    for node in nm.values():
+        mask = node["flag_mask"]
+        # Exclude SKIP nodes and HIDE nodes whose collection is hidden
+        node["ui_visible"] = not (mask & F_SKIP) and (not (mask & F_HIDE) or node["is_visible"])
     # Initialize buffers for top-level category branches
     raw_vis = []
     raw_props = []
@@ -551,69 +781,82 @@ def run_ui_data_preparation(scan_result):
     # Categorize root collections into specific UI functional groups
     for r_name in roots:
         node = nm[r_name]
-        valid_children = [c for c in node["children"] if is_ui_visible(c)]
-        if "(DISPLAYS)" in r_name: raw_vis.extend(valid_children)
-        elif "(SETTINGS)" in r_name: raw_props.extend(valid_children)
-        elif "(SNAPS)" in r_name: raw_snaps.extend(valid_children)
-        elif "(INTERNALS)" in r_name: continue
+        valid_children = [c for c in node["children"] if nm[c]["ui_visible"]]
+        # Bucket by the scanner's tree context so tag priority is decided in one place
+        tree_type = node["tree_type"]
+        if tree_type == CTX_VIS: raw_vis.extend(valid_children)
+        elif tree_type == CTX_PROP: raw_props.extend(valid_children)
+        elif tree_type == CTX_SNAP: raw_snaps.extend(valid_children)
     # Generate layout grouping and resolve property links for top-level items
     data["vis_display"] = _helper_generate_clean_layout(raw_vis, nm)
     data["props_others"] = _helper_generate_clean_layout(raw_props, nm)
     if raw_props: data["found_settings"] = True
     _helper_resolve_links(raw_props, nm)
 
-    def process_snap_group(group_id):
+    # Process snapping layout and group hierarchy
+    valid_raw_snaps = [s for s in raw_snaps if nm[s]["ui_visible"]]
+    data["snap_layout"] = _helper_generate_clean_layout(valid_raw_snaps, nm)
+    # Walk snap folders with an explicit stack, reversed pushes keep the pre-order of the recursive walk
+    stack = valid_raw_snaps[::-1]
+    while stack:
+        group_id = stack.pop()
         # Identify and pair source/target bones within a snapping group
-        node = nm.get(group_id)
-        if not node: return
+        node = nm[group_id]
         children = node["children"]
         pair_list = []
-        i = 0
-        while i < len(children):
-            curr_id = children[i]
-            curr_node = nm.get(curr_id)
-            # Use positional forward linking for 'TO' flags to establish snap pairs
-            if curr_node and "TO" in curr_node["active_flags"]:
-                if i + 1 < len(children):
-                    target_id = children[i + 1]
-                    pair_list.append((curr_id, target_id))
-                    i += 2; continue
-            i += 1
+        child_iter = iter(children)
+        for curr_id in child_iter:
+            # Use positional forward linking for 'TO' flags, the target is consumed with its source
+            if nm[curr_id]["flag_mask"] & F_TO:
+                target_id = next(child_iter, None)
+                if target_id is not None: pair_list.append((curr_id, target_id))
         # Register the node as a snap group if pairs were successfully created
         if pair_list:
             data["snap_groups"][group_id] = pair_list
             node["is_snap_group"] = True
         else:
-            # Recursively process children if no snap pairs exist at the current level
-            valid_snap_children = [c for c in children if is_ui_visible(c)]
+            # Descend into children if no snap pairs exist at the current level
+            valid_snap_children = [c for c in children if nm[c]["ui_visible"]]
             node["ui_layout"] = _helper_generate_clean_layout(valid_snap_children, nm)
-            for c in valid_snap_children: process_snap_group(c)
-    # Process snapping layout and group hierarchy
-    valid_raw_snaps = [s for s in raw_snaps if is_ui_visible(s)]
-    data["snap_layout"] = _helper_generate_clean_layout(valid_raw_snaps, nm)
-    for r in valid_raw_snaps: process_snap_group(r)
-
-    def prepare_recursive(node_id):
-        # Recursively build the UI layout structure for nested collections
-        node = nm[node_id]
+            stack.extend(valid_snap_children[::-1])
+    # Build the UI layout structure for nested collections of all categorized branches
+    stack = (raw_vis + raw_props + valid_raw_snaps)[::-1]
+    while stack:
+        node = nm[stack.pop()]
         valid_children = [
             c for c in node["children"] 
-            if nm.get(c, {}).get("tree_type") == node["tree_type"] and is_ui_visible(c)
+            if nm[c]["tree_type"] == node["tree_type"] and nm[c]["ui_visible"]
         ]
         # Resolve property linking specifically within the settings context
         if node["tree_type"] == CTX_PROP:
              _helper_resolve_links(valid_children, nm)
-        # Generate formatted layout rows for children and continue recursion
+        # Generate formatted layout rows for children and continue the walk
         node["ui_layout"] = _helper_generate_clean_layout(valid_children, nm)
-        for c in valid_children: prepare_recursive(c)
-    # Trigger final layout preparation for all categorized branches
-    for r in raw_vis + raw_props + valid_raw_snaps:
-        prepare_recursive(r)
-    # Scan node map for established links to update global state
+        stack.extend(valid_children[::-1])
+    # Precompute per-node draw fields once so the drawers skip fallbacks and flag tests on every redraw
     for node in nm.values():
-        if node.get("link_meta"): data["has_links"] = True; break
+        mask = node["flag_mask"]
+        icon = node["icon_name"]
+        has_content = bool(node["ui_layout"]) or node["overflow"]
+        node["has_children"] = bool(node["ui_layout"])
+        node["has_content"] = has_content
+        node["draw_ops"] = _helper_build_draw_ops(node["ui_layout"])
+        node["label_lc"] = lower_name(node["label"])
+        node["prop_keys"] = None
+        node["vis_icon"] = icon or ('FILE_FOLDER' if mask & F_BOARD else ('COLLECTION_NEW' if has_content else 'BONE_DATA'))
+        node["props_icon"] = icon or ('LINKED' if node["link_meta"] else ('FILE_FOLDER' if has_content else 'SETTINGS'))
+        node["snap_icon"] = icon or ('GROUP_BONE' if node["is_snap_group"] else 'FILE_FOLDER')
+        # Scan node map for established links to update global state, sources are kept for Symmetrize All
+        if link := node["link_meta"]:
+            data["has_links"] = True
+            if link["is_source"]: data["link_pairs"].append((node["name"], link["partner"]))
+
+    for key in ("vis_display", "props_others", "snap_layout"):
+        data[key + "_ops"] = _helper_build_draw_ops(data[key])
 
     scan_result.update(data)
+    # Precompute flat search indices once per tree version
+    if armature: _helper_build_search_index(armature, scan_result)
     return scan_result
 
 # ==============================================================================
@@ -625,118 +868,240 @@ def update_and_get_master_tree_data(armature):
     return _rrug_ui_data_cache.get(armature.as_pointer(), _DEFAULT_RRUG_UI_DATA)
 
 def _get_descendant_names(node_map, start_coll_name):
-    # Helper to get all recursive descendants for a node.
-    descendants = []
-    def recurse(name):
-        node = node_map.get(name, {})
-        for child_name in node.get("children", []):
-            descendants.append(child_name)
-            recurse(child_name)
-    recurse(start_coll_name)
-    return descendants
+    # Helper to get all recursive descendants for a node, precomputed by the scanner.
+    node = node_map.get(start_coll_name)
+    return node["descendants"] if node else _EMPTY_TUPLE
+
+def _probe_coll_is_solo(coll):
+    global _coll_has_is_solo
+    # Probe the BoneCollection API once, every collection shares the same RNA type
+    if _coll_has_is_solo is None: _coll_has_is_solo = hasattr(coll, "is_solo")
+    return _coll_has_is_solo
+
+def _report_cascade_error():
+    global _cascade_error_reported
+    # Log an unexpected BoneCollection API change once instead of on every tick
+    if _cascade_error_reported: return
+    _cascade_error_reported = True
+    print("RRUG UI: Solo cascade failed, BoneCollection API mismatch")
+    traceback.print_exc()
 
 def _cascade_solo_state(armature, scan_result, start_coll_name, new_state):
     # Apply solo state recursively to descendants.
     start_collection = safe_get_collection(armature, start_coll_name)
     if not start_collection: return
+    has_solo = _probe_coll_is_solo(start_collection)
     node_map = scan_result.get("node_map", {})
-    to_toggle_names = [start_coll_name] + _get_descendant_names(node_map, start_coll_name)
-    for name in to_toggle_names:
-        coll = safe_get_collection(armature, name)
-        if not coll: continue
-        final_state = new_state
-        node_data = node_map.get(name, {})
-        # Respect HIDE flag: do not solo if hidden.
-        if new_state:
-            if "HIDE" in node_data.get("active_flags", set()) and not coll.is_visible:
-                final_state = False
-        if getattr(coll, "is_solo", None) != final_state:
-            try: coll.is_solo = final_state
-            except AttributeError: pass
-        if node_data: node_data["is_solo"] = final_state
-
-def _run_temporal_comparator(old_packet, new_packet, manifest):
-    # Compare two packets for changes in monitored keys.
+    to_toggle_names = [start_coll_name, *_get_descendant_names(node_map, start_coll_name)]
+    try:
+        for name in to_toggle_names:
+            coll = safe_get_collection(armature, name)
+            if not coll: continue
+            final_state = new_state
+            node_data = node_map.get(name)
+            # Respect HIDE flag: do not solo if hidden.
+            if new_state:
+                if node_data and node_data["hide_flag"] and not coll.is_visible:
+                    final_state = False
+            if has_solo and coll.is_solo != final_state: coll.is_solo = final_state
+            if node_data:
+                node_data["is_solo"] = final_state
+                _refresh_record_hash(node_data)
+    except AttributeError: _report_cascade_error()
+    # The cached packet no longer matches a settled guard pass
+    if node_map: scan_result["guard_settled"] = False
+
+def _refresh_record_hash(node):
+    # Keep the fingerprint in step with state written back by the guards, mirrors the scanner formula
+    node["record_hash"] = hash((node["name"], node["is_visible"], node["is_solo"], node["parent"], node.get("overflow", False)))
+
+def _run_temporal_comparator(old_packet, node_map):
+    # Compare visibility and solo state against the previous packet in one sweep, unchanged fingerprints are skipped outright.
+    # Returns the change log {coll_name: {property: new_value}} and the guard worklist seeds,
+    # seeds is None when the previous packet did not settle and the whole tree must be reconciled.
     diff_log = {}
-    keys_to_monitor = manifest.get("monitored_keys", [])
-    if not keys_to_monitor: return diff_log
+    seeds = []
     old_map = old_packet.get("node_map", {}) if old_packet else {}
-    new_map = new_packet.get("node_map", {})
-    for coll_name, new_node in new_map.items():
+    for coll_name, new_node in node_map.items():
         old_node = old_map.get(coll_name)
-        if not old_node: continue
-        changes = []
-        for key in keys_to_monitor:
-            new_val = new_node.get(key)
-            old_val = old_node.get(key)
-            if new_val != old_val:
-                changes.append({"property": key, "to": new_val})
+        if old_node is None:
+            seeds.append(coll_name)
+            continue
+        if old_node["children"] != new_node["children"]: seeds.append(coll_name)
+        if old_node["record_hash"] == new_node["record_hash"]: continue
+        seeds.append(coll_name)
+        new_vis, new_solo = new_node["is_visible"], new_node["is_solo"]
+        changes = {}
+        if new_vis != old_node["is_visible"]: changes["is_visible"] = new_vis
+        if new_solo != old_node["is_solo"]: changes["is_solo"] = new_solo
         if changes: diff_log[coll_name] = changes
-    return diff_log
+    if not old_packet or not old_packet.get("guard_settled"): return diff_log, None
+    # Nodes exempted by the previous change log lose that exemption now
+    seeds.extend(name for name in old_packet.get("change_log", {}) if name in node_map)
+    return diff_log, seeds
 
 # --- Specialized Guards ---
 
-def _guard_hide_state(armature, change_log, node_map, current_packet):
-    # Handles visibility-based solo logic for HIDE collections IF parent is soloed.
-    did_act = False
-    for coll_name, node_data in node_map.items():
-        if "HIDE" not in node_data.get("active_flags", set()): continue
-        # REQUISITE: Only trigger if the parent is soloed
-        parent_id = node_data.get("parent")
-        if parent_id:
-            parent_node = node_map.get(parent_id)
-            if not (parent_node and parent_node.get("is_solo")):
-                continue
-        coll_changes = change_log.get(coll_name, [])
-        vis_change = next((c for c in coll_changes if c["property"] == "is_visible"), None)
-        if vis_change:
-            # Transition Hidden -> Visible: Restore solo
-            if vis_change["to"] is True:
-                if not node_data.get("is_solo"):
-                    _cascade_solo_state(armature, current_packet, coll_name, True)
-                    did_act = True
-            # Transition Visible -> Hidden: Force solo OFF
-            else:
-                if node_data.get("is_solo"):
-                    _cascade_solo_state(armature, current_packet, coll_name, False)
-                    did_act = True
-        # Safety Net: Prevent invisible HIDE items from being soloed if parent is soloed
-        elif not node_data.get("is_visible") and node_data.get("is_solo"):
-            _cascade_solo_state(armature, current_packet, coll_name, False)
-            did_act = True
-
-    return did_act
-
-def _guard_solo_state(armature, change_log, node_map, current_packet):
-    # Handles structural "Empty Nest" and "Full Nest" logic.
+def _build_guard_view(node_map):
+    # Flatten the node map into parallel arrays indexed by traversal position for the guard loop
+    names = list(node_map)
+    index = {name: i for i, name in enumerate(names)}
+    nodes = [node_map[name] for name in names]
+    hide_flag = bytearray(n["hide_flag"] for n in nodes)
+    children_idx = [[index[c] for c in n["children"] if c in index] for n in nodes]
+    view = {
+        "names": names,
+        "index": index,
+        "is_visible": bytearray(n["is_visible"] for n in nodes),
+        "is_solo": bytearray(n["is_solo"] for n in nodes),
+        "hide_flag": hide_flag,
+        "parent_idx": [index.get(n["parent"], -1) if n["parent"] else -1 for n in nodes],
+        "children_idx": children_idx,
+        "hide_children_idx": [[c for c in cs if hide_flag[c]] for cs in children_idx],
+        # Static candidate lists for each guard, the only nodes either rule can ever act on
+        "hide_node_idx": [i for i, flag in enumerate(hide_flag) if flag],
+        "parent_node_idx": [i for i, cs in enumerate(children_idx) if cs],
+        "descendants_idx": [[index[d] for d in n["descendants"] if d in index] for n in nodes],
+        "colls": [None] * len(names),
+        "touched": set(),
+        # Worklist keys: i for the hide rule of node i, solo_base + i for its nest rules
+        "sweep": {"active": False, "cursor": -1, "heap": [], "queued": set(), "pending": set(), "solo_base": len(names)}
+    }
+    return view
+
+def _queue_guard_key(sweep, key):
+    # Keys ahead of the running pass join it, everything else waits for the next pass
+    if sweep["active"] and key > sweep["cursor"]:
+        if key not in sweep["queued"]:
+            sweep["queued"].add(key)
+            heappush(sweep["heap"], key)
+    else:
+        sweep["pending"].add(key)
+
+def _mark_guard_dirty(view, indices):
+    # Queue every rule whose inputs read the state of the given nodes
+    sweep = view["sweep"]
+    solo_base = sweep["solo_base"]
+    parent_idx, children_idx, hide_flag = view["parent_idx"], view["children_idx"], view["hide_flag"]
+    hide_children_idx = view["hide_children_idx"]
+    for i in indices:
+        if hide_flag[i]: _queue_guard_key(sweep, i)
+        if children_idx[i]: _queue_guard_key(sweep, solo_base + i)
+        for c in hide_children_idx[i]: _queue_guard_key(sweep, c)
+        if parent_idx[i] >= 0: _queue_guard_key(sweep, solo_base + parent_idx[i])
+
+def _seed_guard_worklist(view, seeds):
+    # Queue the seeded nodes and their dependents, or every candidate on a full reconcile
+    if seeds is None:
+        solo_base = view["sweep"]["solo_base"]
+        view["sweep"]["pending"].update(view["hide_node_idx"])
+        view["sweep"]["pending"].update(solo_base + i for i in view["parent_node_idx"])
+        return
+    index = view["index"]
+    _mark_guard_dirty(view, [index[name] for name in seeds])
+
+def _guard_collection(armature, view, i):
+    # Resolve a bone collection once per guard_enforcer call, misses are retried
+    coll = view["colls"][i]
+    if coll is None:
+        coll = view["colls"][i] = safe_get_collection(armature, view["names"][i])
+    return coll
+
+def _cascade_solo_view(armature, view, start_idx, new_state):
+    # Array counterpart of _cascade_solo_state used inside the stabilization loop, returns the touched indices
+    if not (start_collection := _guard_collection(armature, view, start_idx)): return []
+    has_solo = _probe_coll_is_solo(start_collection)
+    is_visible, is_solo, hide_flag = view["is_visible"], view["is_solo"], view["hide_flag"]
+    touched = []
+    try:
+        for i in [start_idx] + view["descendants_idx"][start_idx]:
+            coll = _guard_collection(armature, view, i)
+            if not coll: continue
+            final_state = new_state
+            # Respect HIDE flag: do not solo if hidden.
+            if new_state and hide_flag[i] and not coll.is_visible:
+                final_state = False
+            if has_solo and coll.is_solo != final_state: coll.is_solo = final_state
+            # Read back after the write to capture anything Blender refused or clamped
+            solo, visible = coll.is_solo if has_solo else final_state, coll.is_visible
+            if is_solo[i] != solo or is_visible[i] != visible:
+                is_solo[i] = solo
+                is_visible[i] = visible
+                touched.append(i)
+    except AttributeError: _report_cascade_error()
+    _mark_guard_dirty(view, touched)
+    view["touched"].update(touched)
+    return touched
+
+def _guard_hide_state(armature, change_log, view, i):
+    # Handles visibility-based solo logic for a HIDE collection IF its parent is soloed.
+    is_solo = view["is_solo"]
+    # REQUISITE: Only trigger if the parent is soloed
+    p = view["parent_idx"][i]
+    if p >= 0 and not is_solo[p]: return False
+    changes = change_log.get(view["names"][i])
+    vis_to = changes.get("is_visible") if changes else None
+    if vis_to is not None:
+        # Transition Hidden -> Visible: Restore solo
+        if vis_to is True:
+            if not is_solo[i]:
+                _cascade_solo_view(armature, view, i, True)
+                return True
+        # Transition Visible -> Hidden: Force solo OFF
+        else:
+            if is_solo[i]:
+                _cascade_solo_view(armature, view, i, False)
+                return True
+    # Safety Net: Prevent invisible HIDE items from being soloed if parent is soloed
+    elif not view["is_visible"][i] and is_solo[i]:
+        _cascade_solo_view(armature, view, i, False)
+        return True
+    return False
+
+def _guard_solo_state(armature, change_log, view, i):
+    # Handles structural "Empty Nest" and "Full Nest" logic for a node with children.
+    is_visible, is_solo, hide_flag = view["is_visible"], view["is_solo"], view["hide_flag"]
+    curr_solo = is_solo[i]
+    # Scan children state in one pass over the byte arrays, ignoring invisible HIDE collections.
+    has_relevant = False
+    all_children_solo = True
+    no_children_solo = True
+    for c in view["children_idx"][i]:
+        if hide_flag[c] and not is_visible[c]: continue
+        has_relevant = True
+        if is_solo[c]: no_children_solo = False
+        else: all_children_solo = False
+    if not has_relevant: return False
+    # Rule 1: EMPTY NEST -> Un-solo parent
+    if curr_solo and no_children_solo:
+        changes = change_log.get(view["names"][i])
+        just_turned_on = bool(changes) and changes.get("is_solo") is True
+        if not just_turned_on:
+            _cascade_solo_view(armature, view, i, False)
+            return True
+    # Rule 2: FULL NEST -> Auto-solo parent
+    elif not curr_solo and all_children_solo:
+        _cascade_solo_view(armature, view, i, True)
+        return True
+    return False
+
+def _run_guard_pass(armature, change_log, view):
+    # One fused sweep over the worklist, every hide rule in traversal order followed by every nest rule
+    sweep = view["sweep"]
+    solo_base = sweep["solo_base"]
+    heap = sorted(sweep["pending"])
+    sweep.update(active=True, cursor=-1, heap=heap, queued=set(heap), pending=set())
     did_act = False
-    for coll_name, node_data in node_map.items():
-        children_ids = node_data.get("children")
-        if not children_ids: continue 
-        curr_solo = node_data.get("is_solo")
-        # Filter children: ignore invisible HIDE collections.
-        relevant_children = []
-        for cid in children_ids:
-            c_node = node_map.get(cid)
-            if not c_node: continue
-            if "HIDE" in c_node.get("active_flags", set()) and not c_node.get("is_visible"):
-                continue
-            relevant_children.append(c_node)
-        if not relevant_children: continue
-        # Scan filtered children state
-        all_children_solo = all(c.get("is_solo") for c in relevant_children)
-        no_children_solo = not any(c.get("is_solo") for c in relevant_children)
-        # Rule 1: EMPTY NEST -> Un-solo parent
-        if curr_solo and no_children_solo:
-            changes = change_log.get(coll_name, [])
-            just_turned_on = any(c["property"] == "is_solo" and c["to"] is True for c in changes)
-            if not just_turned_on:
-                _cascade_solo_state(armature, current_packet, coll_name, False)
-                did_act = True
-        # Rule 2: FULL NEST -> Auto-solo parent
-        elif not curr_solo and all_children_solo:
-            _cascade_solo_state(armature, current_packet, coll_name, True)
+    while heap:
+        key = heappop(heap)
+        sweep["cursor"] = key
+        if key < solo_base: acted = _guard_hide_state(armature, change_log, view, key)
+        else: acted = _guard_solo_state(armature, change_log, view, key - solo_base)
+        # A rule that acted is checked again on the next pass
+        if acted:
+            sweep["pending"].add(key)
             did_act = True
+    sweep["active"] = False
     return did_act
 
 def guard_enforcer(arm, old_packet, current_packet):
@@ -744,219 +1109,307 @@ def guard_enforcer(arm, old_packet, current_packet):
     node_map = current_packet.get("node_map", {})
     if not node_map: return current_packet
 
-    manifest = {"monitored_keys": ["is_visible", "is_solo"]}
-    change_log = _run_temporal_comparator(old_packet, current_packet, manifest)
-
-    # Stabilize states iteratively.
+    change_log, seeds = _run_temporal_comparator(old_packet, node_map)
+    # Nothing differs from a settled packet, so no invariant can have been broken
+    if seeds is not None and not seeds:
+        current_packet["change_log"] = change_log
+        current_packet["guard_settled"] = True
+        return current_packet
+    view = _build_guard_view(node_map)
+    _seed_guard_worklist(view, seeds)
+    names, is_visible, is_solo = view["names"], view["is_visible"], view["is_solo"]
+
+    # Stabilize states iteratively, each pass only visits rules queued by the previous one.
     max_iters = 10
+    settled = False
     for _ in range(max_iters):
-        act_h = _guard_hide_state(arm, change_log, node_map, current_packet)
-        act_s = _guard_solo_state(arm, change_log, node_map, current_packet)
-        
-        if not (act_h or act_s): break
-            
-        for coll in arm.collections_all:
-            node = node_map.get(coll.name)
-            if node:
-                node["is_visible"] = coll.is_visible
-                node["is_solo"] = coll.is_solo
+        if not _run_guard_pass(arm, change_log, view):
+            settled = True
+            break
+
+    # Write the stabilized arrays back onto the node map
+    for i in view["touched"]:
+        node = node_map[names[i]]
+        node["is_visible"] = bool(is_visible[i])
+        node["is_solo"] = bool(is_solo[i])
+        _refresh_record_hash(node)
+    # Remember the outcome so the next call can start from this packet's changes alone
+    current_packet["change_log"] = change_log
+    current_packet["guard_settled"] = settled
                 
     return current_packet
 
+def _splice_packet_state(old_packet, new_packet):
+    # Patch live solo/visibility state into a prepared packet of the same structure, False if it needs a fresh preparation
+    if not old_packet: return False
+    old_map = old_packet.get("node_map", {})
+    new_map = new_packet["node_map"]
+    if len(old_map) != len(new_map): return False
+    for name, node in new_map.items():
+        old_node = old_map.get(name)
+        if old_node is None: return False
+        # HIDE visibility decides ui_visible, the layout built from it would go stale
+        if node["hide_flag"] and node["is_visible"] != old_node["is_visible"]: return False
+    stale_vis_index = False
+    for name, node in new_map.items():
+        old_node = old_map[name]
+        # (FILTER)[IFHIDDEN] reads visibility, let the visibility search index rebuild lazily
+        if node["flag_mask"] & F_FILTER and node["is_visible"] != old_node["is_visible"]: stale_vis_index = True
+        old_node["is_visible"] = node["is_visible"]
+        old_node["is_solo"] = node["is_solo"]
+        old_node["record_hash"] = node["record_hash"]
+    if stale_vis_index: old_packet.pop("_vis_index", None)
+    for key in ("state_hash", "change_log", "guard_settled"): old_packet[key] = new_packet.get(key)
+    return True
+
 def rrug_ui_timer_update():
     # Execute main polling loop at a frequency defined by FIXED_FPS
+    global _last_tick_time, _next_tick_time
+    base_interval = interval = 1.0 / FIXED_FPS
+    _last_tick_time = time.monotonic()
     try:
-        global _rrug_ui_data_cache, _entrance_gatekeeper_cache
-        # Identify currently valid armature pointers to prevent memory leaks
-        live_keys = {a.as_pointer() for a in bpy.data.armatures}
-        # Purge cached data for armatures that no longer exist in the Blender session
-        for key in list(_rrug_ui_data_cache.keys()):
-            if key not in live_keys:
-                del _rrug_ui_data_cache[key]
-                if key in _entrance_gatekeeper_cache: del _entrance_gatekeeper_cache[key]
+        global _rrug_ui_data_cache, _entrance_gatekeeper_cache, _sweep_countdown, _swept_armature_count
+        # Start each tick with fresh collection references
+        _coll_cache.clear()
+        # Sweep dead armatures only when the armature count changes, with a periodic fallback
+        armature_count = len(bpy.data.armatures)
+        _sweep_countdown -= 1
+        if _rrug_ui_data_cache and (armature_count != _swept_armature_count or _sweep_countdown <= 0):
+            _swept_armature_count = armature_count
+            _sweep_countdown = CACHE_SWEEP_TICKS
+            # Identify currently valid armature pointers to prevent memory leaks
+            live_keys = {a.as_pointer() for a in bpy.data.armatures}
+            # Purge cached data for armatures that no longer exist in the Blender session
+            for key in list(_rrug_ui_data_cache.keys()):
+                if key not in live_keys:
+                    del _rrug_ui_data_cache[key]
+                    if key in _entrance_gatekeeper_cache: del _entrance_gatekeeper_cache[key]
+                    _idle_streak.pop(key, None)
+                    _parsed_cache.pop(key, None)
         # Verify that the active object is a valid armature and contains the RRUG trigger property
         obj = getattr(bpy.context, "active_object", None)
-        if not obj or obj.type != 'ARMATURE' or not obj.data: return 1.0 / FIXED_FPS
-        if not obj.data.get(RRUG_TRIGGER_KEY): return 1.0 / FIXED_FPS
+        if not obj or obj.type != 'ARMATURE' or not obj.data:
+            _next_tick_time = _last_tick_time + base_interval
+            return base_interval
+        if not obj.data.get(RRUG_TRIGGER_KEY):
+            _next_tick_time = _last_tick_time + base_interval
+            return base_interval
         arm = obj.data
         arm_key = arm.as_pointer()
         # Initiate structure scan to capture the current state of bone collections
         raw_packet = run_structure_scanner(arm)
-        nm = raw_packet["node_map"]
-        order = raw_packet["traversal_order"]
-        # Construct a state snapshot representing visibility and solo status for change detection
-        current_state = tuple(
-            (
-                name, 
-                nm[name]["is_visible"], 
-                nm[name]["is_solo"], 
-                nm[name]["parent"], 
-                nm[name].get("overflow", False)
-            ) 
-            for name in order
-        )
+        # Compare the scan fingerprints of structure and of visibility/solo state for change detection
+        current_state = (raw_packet["structure_hash"], raw_packet["state_hash"])
         cached_state = _entrance_gatekeeper_cache.get(arm_key)
         # Trigger processing pipeline only if a structural or state change is detected
         if current_state != cached_state:
             # Update the gatekeeper cache with the new state snapshot
             _entrance_gatekeeper_cache[arm_key] = current_state
             # Parse raw collection names into validated UI metadata
-            parsed_packet = run_data_parsing(raw_packet)
+            cached = _parsed_cache.pop(arm_key, None)
+            parsed_packet = run_data_parsing(raw_packet, cached[1] if cached and cached[0] == current_state[0] else None)
+            # Keep the most recently used armatures last and cap the cache
+            _parsed_cache[arm_key] = (current_state[0], parsed_packet["parsed_fields"])
+            while len(_parsed_cache) > PARSED_CACHE_LIMIT: del _parsed_cache[next(iter(_parsed_cache))]
             old_packet = _rrug_ui_data_cache.get(arm_key)
             # Stabilize states using guard logic and prepare the final UI layout structure
             stabilized_packet = guard_enforcer(arm, old_packet, parsed_packet)
-            final_packet = run_ui_data_preparation(stabilized_packet)
+            # A state-only change keeps the previous layout whenever no HIDE row appeared or vanished
+            if cached_state and cached_state[0] == current_state[0] and _splice_packet_state(old_packet, stabilized_packet):
+                final_packet = old_packet
+            else:
+                final_packet = run_ui_data_preparation(stabilized_packet, arm)
             # Commit the prepared packet to the global cache and request a viewport redraw
             _rrug_ui_data_cache[arm_key] = final_packet
             limited_redraw()
+            _idle_streak.pop(arm_key, None)
+        else:
+            # Back off exponentially while the armature stays quiescent, capped at one second
+            streak = _idle_streak[arm_key] = _idle_streak.get(arm_key, 0) + 1
+            interval = min(1.0, base_interval * (1 << min(streak, 6)))
     except Exception:
         # Log any internal engine errors to the console for debugging
         traceback.print_exc()
-    # Schedule the next timer execution based on the fixed FPS interval
-    return 1.0 / FIXED_FPS
+    # Schedule the next timer execution from the fixed FPS interval and the idle backoff
+    _next_tick_time = _last_tick_time + interval
+    return interval
 # ==============================================================================
 # SECTION 5: UI DRAWING LOGIC
 # ==============================================================================
 def _draw_expand_buttons(layout, panel_type):
     row = layout.row(align=True)
-    op_col = row.operator("rrug_ui.expand_all", text="", icon='FULLSCREEN_EXIT')
+    op_col = row.operator(_OP_EXPAND_ALL, text="", icon='FULLSCREEN_EXIT')
     op_col.action = 'COLLAPSE'; op_col.panel = panel_type
-    op_exp = row.operator("rrug_ui.expand_all", text="", icon='FULLSCREEN_ENTER')
+    op_exp = row.operator(_OP_EXPAND_ALL, text="", icon='FULLSCREEN_ENTER')
     op_exp.action = 'EXPAND'; op_exp.panel = panel_type
 
-def draw_vis_recursive(layout, armature, node_id, ui_data, depth=0):
-    # Terminate recursion if the maximum nesting depth is exceeded
-    if depth > MAX_UI_NESTING: return
-    # Retrieve node metadata and the corresponding bone collection
-    nm = ui_data.get("node_map", {})
-    node = nm.get(node_id)
-    if not node: return
-    if not (coll := safe_get_collection(armature, node_id)): return
-    # Extract UI properties
+def _emit_bone_btns(btns, coll, node_id, hide_flag):
+    # Emit select, visibility and solo buttons, the visibility toggle is left to the guard for HIDE collections
+    btns.operator(_OP_SEL_REPLACE, text="", icon='RESTRICT_SELECT_OFF').collection_name = node_id
+    btns.operator(_OP_SEL_ADD, text="", icon='ADD').collection_name = node_id
+    if not hide_flag:
+        btns.operator(_OP_VIS_TOGGLE, text="", icon=_HIDE_ICONS[coll.is_visible]).collection_name = node_id
+    btns.operator(_OP_SOLO_TOGGLE, text="", icon=_SOLO_ICONS[coll.is_solo]).collection_name = node_id
+
+def _emit_snap_btns(btn_row, node_id):
+    # Emit the batch snap buttons for one snap group from the static channel table
+    for icon, snap_loc, snap_rot, snap_scale in _SNAP_BTNS:
+        op = btn_row.operator(_OP_SNAP_BATCH, text="", icon=icon)
+        op.parent_collection_name = node_id; op.snap_loc = snap_loc; op.snap_rot = snap_rot; op.snap_scale = snap_scale
+
+def _draw_tree(container, draw_ops, draw_node, armature, ui_data, plan_key):
+    nm = ui_data.get("node_map")
+    if not nm: return
+    # Resolve the armature key once per pass and probe the frame cache directly
+    arm_key = armature.as_pointer()
+    cached_coll = _coll_cache.get
+    # Replay the recorded plan while every drawn node keeps its expansion state
+    plan = ui_data.get(plan_key)
+    if plan is not None:
+        steps, node_ids, expanded = plan
+        colls = []
+        for node_id in node_ids:
+            coll = cached_coll((arm_key, node_id))
+            if coll is None and not (coll := safe_get_collection(armature, node_id)): break
+            colls.append(coll)
+        else:
+            if bytes([coll.is_expanded for coll in colls]) == expanded:
+                _emit_draw_plan(container, steps, colls, draw_node)
+                return
+    # Walk the layout with an explicit LIFO stack, tasks are pushed in reverse so the draw order matches the layout
+    # Every executed step is recorded and opens one container slot (None when nothing was opened)
+    containers = [container]
+    steps = []; node_ids = []; colls = []
+    stack = [(_TASK_OPS, 0, draw_ops, 0)]
+    push = stack.append; pop = stack.pop
+    # Bind the loop constants and helpers as locals
+    task_node, task_ops, task_split, task_overflow = _TASK_NODE, _TASK_OPS, _TASK_SPLIT, _TASK_OVERFLOW
+    draw_single = _DRAW_SINGLE
+    add_step = steps.append; add_container = containers.append
+    while stack:
+        tag, slot, payload, depth = pop()
+        layout = containers[slot]
+        if tag == task_node:
+            node = nm.get(payload)
+            if not node: continue
+            coll = cached_coll((arm_key, payload))
+            if coll is None and not (coll := safe_get_collection(armature, payload)): continue
+            # Draw the header, a returned container means the node is open for its content
+            inner = draw_node(layout, coll, payload, node, depth)
+            add_step((task_node, slot, (payload, node, depth), len(colls)))
+            node_ids.append(payload); colls.append(coll)
+            add_container(inner)
+            if inner is None: continue
+            inner_slot = len(containers) - 1
+            # Overflow warning goes below the children, so it is pushed first
+            if node["overflow"]: push((task_overflow, inner_slot, None, depth))
+            if node["has_children"]: push((task_ops, inner_slot, node["draw_ops"], depth + 1))
+        elif tag == task_ops:
+            for op_tag, ids, factors in reversed(payload):
+                if op_tag == draw_single: push((task_node, slot, ids, depth))
+                else: push((task_split, slot, (ids, factors, 0), depth))
+        elif tag == task_split:
+            # Splits are chained lazily, the next one must follow the items drawn into the previous cell
+            ids, factors, j = payload
+            if j: split = layout.split(factor=factors[j], align=True)
+            else: split = layout.row(align=True).split(factor=factors[0], align=True)
+            add_step((task_split, slot, factors[j], j))
+            add_container(split)
+            split_slot = len(containers) - 1
+            if j + 1 < len(ids): push((task_split, split_slot, (ids, factors, j + 1), depth))
+            push((task_node, split_slot, ids[j], depth))
+        else:
+            _draw_overflow_box(layout)
+            add_step((task_overflow, slot, None, 0))
+            add_container(None)
+    ui_data[plan_key] = (tuple(steps), tuple(node_ids), bytes([coll.is_expanded for coll in colls]))
+
+def _emit_draw_plan(container, steps, colls, draw_node):
+    # Emit a recorded plan in one linear pass, each step fills the next container slot
+    containers = [container]
+    push = containers.append
+    task_node, task_split = _TASK_NODE, _TASK_SPLIT
+    for tag, slot, payload, index in steps:
+        layout = containers[slot]
+        if layout is None: push(None)
+        elif tag == task_node:
+            node_id, node, depth = payload
+            push(draw_node(layout, colls[index], node_id, node, depth))
+        elif tag == task_split:
+            if index: push(layout.split(factor=payload, align=True))
+            else: push(layout.row(align=True).split(factor=payload, align=True))
+        else:
+            _draw_overflow_box(layout)
+            push(None)
+
+def _draw_header_row(box, coll, lbl, icon, is_valid, expandable):
+    # Draw a node header row, an expandable header doubles as the is_expanded toggle
+    row = box.row(align=True)
+    if not is_valid: row.alert = True
+    if expandable: row.prop(coll, "is_expanded", text=lbl, icon=icon)
+    else: row.label(text=lbl, icon=icon)
+    return row
+
+def _draw_overflow_box(layout):
+    err_row = layout.box().row(align=True); err_row.alert = True
+    err_row.label(text="Max Depth Exceeded", icon='ERROR')
+
+def draw_vis_node(layout, coll, node_id, node, depth):
+    # Skip nodes beyond the maximum nesting depth
+    if depth > MAX_UI_NESTING: return None
+    # Extract UI properties, precomputed by the UI data preparation
     lbl = node["label"]
-    is_valid = node.get("is_valid", True)
-    flags = node["active_flags"]
-    # Check for content: Valid Children OR an Overflow flag
-    has_children = bool(node["ui_layout"])
-    has_overflow = node.get("overflow", False)
+    is_valid = node["is_valid"]
+    mask = node["flag_mask"]
     
     # --- BRANCH: BOARD MODE ---
-    if "BOARD" in flags:
+    if mask & F_BOARD:
         box = layout.box()
         # Header Row
-        row = box.row(align=True)
-        if not is_valid: row.alert = True
-        
         # 1. Label (Left)
-        ic = node.get("icon_name") or 'FILE_FOLDER'
-        row.label(text=lbl, icon=ic)
+        row = _draw_header_row(box, coll, lbl, node["vis_icon"], is_valid, False)
         
         # 2. Buttons (Right)
         # Create a sub-row for buttons to keep them aligned to the right or integrated
         btns = row.row(align=True)
         btns.alignment = 'RIGHT'
-        
-        btns.operator("rrug_ui.select_replace", text="", icon='RESTRICT_SELECT_OFF').collection_name = node_id
-        btns.operator("rrug_ui.select_add", text="", icon='ADD').collection_name = node_id
-        
-        if "HIDE" not in flags:
-            btns.operator("rrug_ui.vis_toggle", text="",
-                        icon='HIDE_OFF' if coll.is_visible else 'HIDE_ON').collection_name = node_id 
-                        
-        btns.operator("rrug_ui.solo_toggle", text="",
-                    icon='SOLO_ON' if coll.is_solo else 'SOLO_OFF').collection_name = node_id
+        _emit_bone_btns(btns, coll, node_id, node["hide_flag"])
         
         # Render children unconditionally (Always Open)
-        inner = box.column(align=True)
-        if has_children:
-            for row_group in node["ui_layout"]:
-                if isinstance(row_group, list):
-                    if len(row_group) == 1:
-                        draw_vis_recursive(inner, armature, row_group[0], ui_data, depth + 1)
-                    else:
-                        split = inner.row(align=True).split(factor=1.0 / len(row_group), align=True)
-                        for k, i in enumerate(row_group):
-                            draw_vis_recursive(split, armature, i, ui_data, depth + 1)
-                            if k < len(row_group) - 1:
-                                split = split.split(factor=1.0 / (len(row_group) - (k + 1)), align=True)
-        if has_overflow:
-            err_box = inner.box(); err_row = err_box.row(align=True); err_row.alert = True
-            err_row.label(text="Max Depth Exceeded", icon='ERROR')
+        return box.column(align=True)
             
     # --- BRANCH: STANDARD MODE ---
+    show_expand = node["has_content"]
+    box = layout.box()
+    # Render either an expansion toggle or a static label based on content availability
+    row = _draw_header_row(box, coll, lbl, node["vis_icon"], is_valid, show_expand)
+    # Assign the button container to the main row or a secondary centered row, based on the INLINE flag
+    if mask & F_INLINE: btns = row
     else:
-        show_expand = has_children or has_overflow
-        box = layout.box()
-        # Configure row alignment based on the presence of the INLINE flag
-        is_inline = "INLINE" in flags
-        row = box.row(align=True)
-        if not is_valid: row.alert = True
-        # Assign the button container to the main row or a secondary centered row
-        if is_inline: btns = row
-        else:
-            row.alignment = 'CENTER'
-            btns = box.row(align=True)
-            btns.alignment = 'CENTER'
-        # Select icon: Use folder if expandable (children or overflow), else bone
-        default_icon = 'COLLECTION_NEW' if show_expand else 'BONE_DATA'
-        ic = node.get("icon_name") or default_icon
-        # Render either an expansion toggle or a static label based on content availability
-        if show_expand: row.prop(coll, "is_expanded", text=lbl, icon=ic)
-        else: row.label(text=lbl, icon=ic)
-        # Add selection operators for bone management
-        btns.operator("rrug_ui.select_replace", text="", icon='RESTRICT_SELECT_OFF').collection_name = node_id
-        btns.operator("rrug_ui.select_add", text="", icon='ADD').collection_name = node_id
-        # Conditionally add visibility toggle if the HIDE flag is absent
-        if "HIDE" not in flags:
-            btns.operator("rrug_ui.vis_toggle", text="",
-                        icon='HIDE_OFF' if coll.is_visible else 'HIDE_ON').collection_name = node_id 
-        # Add the solo toggle operator
-        btns.operator("rrug_ui.solo_toggle", text="",
-                    icon='SOLO_ON' if coll.is_solo else 'SOLO_OFF').collection_name = node_id
-        # Recursively render content if the collection is expanded
-        if show_expand and coll.is_expanded:
-            inner = box.column(align=True)
-            if has_children:
-                for row_group in node["ui_layout"]:
-                    if isinstance(row_group, list):
-                        if len(row_group) == 1:
-                            draw_vis_recursive(inner, armature, row_group[0], ui_data, depth + 1)
-                        else:
-                            split = inner.row(align=True).split(factor=1.0 / len(row_group), align=True)
-                            for k, i in enumerate(row_group):
-                                draw_vis_recursive(split, armature, i, ui_data, depth + 1)
-                                if k < len(row_group) - 1:
-                                    split = split.split(factor=1.0 / (len(row_group) - (k + 1)), align=True)
-            if has_overflow:
-                err_box = inner.box(); err_row = err_box.row(align=True); err_row.alert = True
-                err_row.label(text="Max Depth Exceeded", icon='ERROR')
-
-def draw_props_recursive(layout, armature, node_id, ui_data):
-    # Retrieve node metadata and verify existence
-    nm = ui_data.get("node_map", {})
-    node = nm.get(node_id)
-    if not node: return
-    if not (coll := safe_get_collection(armature, node_id)): return
-    # Extract Metadata
-    lbl = node.get("label", node_id)
-    is_valid = node.get("is_valid", True)
-    flags = node.get("active_flags", set())
-    link = node.get("link_meta")
-    # Check content types
-    has_children = bool(node.get("ui_layout"))
-    has_overflow = node.get("overflow", False)
+        row.alignment = 'CENTER'
+        btns = box.row(align=True)
+        btns.alignment = 'CENTER'
+    # Add selection, visibility and solo operators for bone management
+    _emit_bone_btns(btns, coll, node_id, node["hide_flag"])
+    # Open the content container if the collection is expanded
+    if show_expand and coll.is_expanded: return box.column(align=True)
+    return None
+
+def draw_props_node(layout, coll, node_id, node, depth):
+    # Extract Metadata, precomputed by the UI data preparation
+    lbl = node["label"]
+    is_valid = node["is_valid"]
+    link = node["link_meta"]
     # Setup Container
     box = layout.box()
     # --- HEADER ROW ---
     row = box.row(align=True)
     if not is_valid: row.alert = True
     # 1. Reset Button (Always available)
-    row.operator("rrug_ui.reset", text="", icon='LOOP_BACK').collection_name = node_id
+    row.operator(_OP_RESET, text="", icon='LOOP_BACK').collection_name = node_id
     # 2. Label / Toggle
-    default_icon = 'LINKED' if link else ('FILE_FOLDER' if (has_children or has_overflow) else 'SETTINGS')
-    ic = node.get("icon_name") or default_icon
-    is_board = "BOARD" in flags
-    if is_board:
+    ic = node["props_icon"]
+    if node["flag_mask"] & F_BOARD:
         row.label(text=lbl, icon=ic)
         show_content = True
     else:
@@ -965,60 +1418,40 @@ def draw_props_recursive(layout, armature, node_id, ui_data):
     # 3. Symmetrize Button (If linked)
     if link:
         src = link["is_source"]
-        op = row.operator("rrug_ui.prop_symmetrize", text="", icon='TRIA_RIGHT' if src else 'TRIA_LEFT')
+        op = row.operator(_OP_PROP_SYMMETRIZE, text="", icon='TRIA_RIGHT' if src else 'TRIA_LEFT')
         op.sync_left_to_right = src
         op.l_name, op.r_name = (node_id, link["partner"]) if src else (link["partner"], node_id)
     # --- CONTENT BLOCK ---
-    if show_content:
-        col = box.column(align=True)
-        # Part A: Custom Properties (Modified for {01} stripping)
-        # -------------------------
-        keys = [k for k in sorted(coll.keys()) if k != "_RNA_UI"]
-        if keys:
-            for k in keys:
-                # Clean the display name using the regex
-                display_name = _PROP_ORDER_PATTERN.sub("", k)
-                col.prop(coll, f'["{k}"]', text=display_name)
-        # Part B: Nested Children
-        # -----------------------
-        if has_children or has_overflow:
-            if keys: col.separator()
-            if has_children:
-                for row_group in node["ui_layout"]:
-                    if isinstance(row_group, list):
-                        if len(row_group) == 1:
-                            draw_props_recursive(col, armature, row_group[0], ui_data)
-                        else:
-                            split = col.row(align=True).split(factor=1.0 / len(row_group), align=True)
-                            for k, i in enumerate(row_group):
-                                draw_props_recursive(split, armature, i, ui_data)
-                                if k < len(row_group) - 1:
-                                    split = split.split(factor=1.0 / (len(row_group) - (k + 1)), align=True)      
-            if has_overflow:
-                err_box = col.box(); err_row = err_box.row(align=True); err_row.alert = True
-                err_row.label(text="Max Depth Exceeded", icon='ERROR')
-        # Part C: Empty State
-        elif not keys:
-            col.label(text="No properties.", icon='INFO')
-
-def draw_snap_recursive(layout, armature, node_id, ui_data):
-    # Fetch node metadata and verify the existence of the bone collection
-    nm = ui_data.get("node_map", {})
-    node = nm.get(node_id)
-    if not node: return
-    coll = safe_get_collection(armature, node_id)
-    if not coll: return
-    # Extract labeling and validation status
-    lbl = node.get("label") or node_id
-    is_valid = node.get("is_valid", True)
-    flags = node.get("active_flags", set())
-    # Logic for structural folders needs to accommodate overflow
-    has_children = bool(node.get("ui_layout"))
-    has_overflow = node.get("overflow", False)
+    if not show_content: return None
+    col = box.column(align=True)
+    # Part A: Custom Properties (Modified for {01} stripping)
+    # -------------------------
+    # Reuse the sorted (data path, display name) list until the collection's keys change
+    raw_keys = tuple(coll.keys())
+    prop_keys = node["prop_keys"]
+    if prop_keys is None or prop_keys[0] != raw_keys:
+        prop_keys = node["prop_keys"] = (raw_keys, tuple((f'["{k}"]', clean_prop_name(k)) for k in sorted(raw_keys) if k != "_RNA_UI"))
+    keys = prop_keys[1]
+    for path, display_name in keys:
+        col.prop(coll, path, text=display_name)
+    # Part B: Nested Children, drawn by the caller into the returned column
+    # -----------------------
+    if node["has_content"]:
+        if keys: col.separator()
+        return col
+    # Part C: Empty State
+    if not keys: col.label(text="No properties.", icon='INFO')
+    return None
+
+def draw_snap_node(layout, coll, node_id, node, depth):
+    # Extract labeling and validation status, precomputed by the UI data preparation
+    lbl = node["label"] or node_id
+    is_valid = node["is_valid"]
+    mask = node["flag_mask"]
     # Process functional snap groups containing bone pairs (Terminal Nodes)
-    if node.get("is_snap_group"):
+    if node["is_snap_group"]:
         # Configure layout flow based on the INLINE flag
-        is_inline = "INLINE" in flags
+        is_inline = mask & F_INLINE
         if is_inline:
             # Map both label and buttons to a single horizontal row
             container = layout.row(align=True)
@@ -1033,107 +1466,67 @@ def draw_snap_recursive(layout, armature, node_id, ui_data):
         # Trigger visual alert if the node metadata is invalid
         if not is_valid: lbl_row.alert = True
         # Render the group label with an icon
-        ic = node.get("icon_name")
-        lbl_row.label(text=lbl, icon=ic if ic else 'GROUP_BONE')
-        # Add discrete snap operators for Location, Rotation, and Scale
-        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='CON_LOCLIKE')
-        op.parent_collection_name = node_id; op.snap_loc = True; op.snap_rot = False; op.snap_scale = False
-        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='CON_ROTLIKE')
-        op.parent_collection_name = node_id; op.snap_loc = False; op.snap_rot = True; op.snap_scale = False
-        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='CON_SIZELIKE')
-        op.parent_collection_name = node_id; op.snap_loc = False; op.snap_rot = False; op.snap_scale = True
-        # Add a master snap operator for all transform channels
-        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='SNAP_ON')
-        op.parent_collection_name = node_id; op.snap_loc = True; op.snap_rot = True; op.snap_scale = True
+        lbl_row.label(text=lbl, icon=node["snap_icon"])
+        # Add discrete snap operators for Location, Rotation, Scale and a master one for all channels
+        _emit_snap_btns(btn_row, node_id)
+        return None
     # Process structural folder collections (Containers)
+    # Determine if we show the expansion arrow (has children or overflow)
+    show_expand = node["has_content"]
+    box = layout.box()
+    
+    # BOARD folders are always open with a static label, STANDARD folders toggle when they have content
+    if mask & F_BOARD:
+        _draw_header_row(box, coll, lbl, node["snap_icon"], is_valid, False)
+        should_draw_children = True
     else:
-        # Determine if we show the expansion arrow (has children or overflow)
-        show_expand = has_children or has_overflow
-        box = layout.box()
-        
-        # --- BRANCH: BOARD MODE ---
-        if "BOARD" in flags:
-            row = box.row(align=True)
-            if not is_valid: row.alert = True
-            ic = node.get("icon_name") or 'FILE_FOLDER'
-            row.label(text=lbl, icon=ic)
-            should_draw_children = True
-        # --- BRANCH: STANDARD MODE ---
-        else:
-            row = box.row(align=True)
-            if not is_valid: row.alert = True
-            ic = node.get("icon_name")
-            icon_to_use = ic if ic else 'FILE_FOLDER'
-            if show_expand:
-                row.prop(coll, "is_expanded", text=lbl, icon=icon_to_use)
-            else:
-                row.label(text=lbl, icon=icon_to_use)
-            should_draw_children = (show_expand and coll.is_expanded)
-        # Recursively render nested snap groups or folders
-        if should_draw_children:
-            inner = box.column(align=True)
-            # 1. Render Children
-            if has_children:
-                for row_group in node.get("ui_layout", []):
-                    if isinstance(row_group, list):
-                        if len(row_group) == 1:
-                            draw_snap_recursive(inner, armature, row_group[0], ui_data)
-                        else:
-                            split = inner.row(align=True).split(factor=1.0 / len(row_group), align=True)
-                            for k, item in enumerate(row_group):
-                                draw_snap_recursive(split, armature, item, ui_data)
-                                if k < len(row_group) - 1:
-                                    split = split.split(factor=1.0 / (len(row_group) - (k + 1)), align=True)
-            # 2. Render Overflow Warning
-            if has_overflow:
-                err_box = inner.box(); err_row = err_box.row(align=True); err_row.alert = True
-                err_row.label(text="Max Depth Exceeded", icon='ERROR')
+        _draw_header_row(box, coll, lbl, node["snap_icon"], is_valid, show_expand)
+        should_draw_children = (show_expand and coll.is_expanded)
+    # Open the container for nested snap groups or folders
+    if should_draw_children: return box.column(align=True)
+    return None
 
 # --- Filtered Drawers ---
+def _iter_layout_nodes(nm, layout_rows):
+    # Walk layout rows depth-first in draw order with an explicit stack, yielding known nodes
+    # Layout rows only ever hold node names, so rows are flattened on push instead of type-tested on pop
+    stack = [name for row in reversed(layout_rows) for name in reversed(row)]
+    while stack:
+        item = stack.pop()
+        node = nm.get(item)
+        if not node: continue
+        yield item, node
+        if children := node["ui_layout"]: stack.extend([name for row in reversed(children) for name in reversed(row)])
+
 def draw_vis_filtered(layout, armature, ui_data, query):
     # Retrieve node map and normalize search query
     nm = ui_data.get("node_map", {})
     query = query.lower()
+    bone_corpus = _get_filter_corpus(armature, ui_data, "_bone_corpus")
+    arm_key = armature.as_pointer()
+    cached_coll = _coll_cache.get
     any_found = False
-    
-    def scan_recursive(layout_list):
-        nonlocal any_found
-        for item in layout_list:
-            if isinstance(item, str):
-                node_id = item
-                node = nm.get(node_id)
-                coll = safe_get_collection(armature, node_id)
-                # Check for bone matches within the current collection
-                if node and coll:
-                    has_match = False
-                    for b in coll.bones:
-                        if query in b.name.lower():
-                            has_match = True
-                            break
-                    # Render collection entry if a match is found
-                    if has_match:
-                        any_found = True
-                        box = layout.box()
-                        row = box.row(align=True)
-                        ic = node.get("icon_name") or 'BONE_DATA'
-                        row.label(text=node.get("label", node_id), icon=ic)
-                        # Draw bone selection and visibility operators
-                        btns = row.row(align=True)
-                        btns.operator("rrug_ui.select_replace", text="", icon='RESTRICT_SELECT_OFF').collection_name = node_id
-                        btns.operator("rrug_ui.select_add", text="", icon='ADD').collection_name = node_id
-                        # Only show visibility toggle if the HIDE flag is not set
-                        if "HIDE" not in node.get("active_flags", set()):
-                            btns.operator("rrug_ui.vis_toggle", text="",
-                                          icon='HIDE_OFF' if coll.is_visible else 'HIDE_ON').collection_name = node_id
-                        btns.operator("rrug_ui.solo_toggle", text="",
-                                      icon='SOLO_ON' if coll.is_solo else 'SOLO_OFF').collection_name = node_id
-                # Recursively process child layouts
-                if node and node.get("ui_layout"): 
-                    scan_recursive(node["ui_layout"])
-            elif isinstance(item, list):
-                scan_recursive(item)
-    # Initiate scan from the visibility display root
-    scan_recursive(ui_data.get("vis_display", []))
+    # Reuse the matching collections while the query and the bone corpus are unchanged
+    hits = ui_data.get("_vis_hits")
+    if hits is None or hits[0] != query or hits[1] is not bone_corpus:
+        # Scan the visibility display root once for bone matches, keeping draw order
+        hits = (query, bone_corpus, tuple(node_id for node_id, _ in _iter_layout_nodes(nm, ui_data.get("vis_display", []))
+                                          if query in bone_corpus.get(node_id, "")))
+        if nm: ui_data["_vis_hits"] = hits
+    for node_id in hits[2]:
+        node = nm[node_id]
+        coll = cached_coll((arm_key, node_id))
+        if coll is None: coll = safe_get_collection(armature, node_id)
+        if not coll: continue
+        # Render collection entry for the match
+        any_found = True
+        box = layout.box()
+        row = box.row(align=True)
+        ic = node["icon_name"] or 'BONE_DATA'
+        row.label(text=node["label"], icon=ic)
+        # Draw bone selection and visibility operators
+        btns = row.row(align=True)
+        _emit_bone_btns(btns, coll, node_id, node["hide_flag"])
     if not any_found: 
         layout.label(text="No matching results found.", icon='INFO')
 
@@ -1141,44 +1534,44 @@ def draw_props_filtered(layout, armature, ui_data, query):
     # Retrieve node map and normalize search query
     nm = ui_data.get("node_map", {})
     query = query.lower()
+    key_corpus = _get_filter_corpus(armature, ui_data, "_key_corpus")
+    arm_key = armature.as_pointer()
+    cached_coll = _coll_cache.get
+    # Reuse per-node matches while the query is unchanged, an entry stays valid as long as its key entries do
+    hits = ui_data.get("_prop_hits")
+    if hits is None or hits[0] != query:
+        hits = (query, {})
+        if nm: ui_data["_prop_hits"] = hits
+    node_hits = hits[1]
     any_found = False
-    
-    def scan_recursive(layout_list):
-        nonlocal any_found
-        for item in layout_list:
-            if isinstance(item, str):
-                node_id = item
-                node = nm.get(node_id)
-                coll = safe_get_collection(armature, node_id)
-                # Scan for matches within property keys or collection labels
-                if node and coll:
-                    node_label = node.get('label', node_id)
-                    matches = []
-                    for k in coll.keys():
-                        if k == "_RNA_UI": continue
-                        # Match query against CLEAN key (or raw key) + label
-                        clean_k = _PROP_ORDER_PATTERN.sub("", k)
-                        if query in k.lower() or query in clean_k.lower() or query in node_label.lower():
-                            matches.append(k)
-                    # Draw matching properties inside a container box
-                    if matches:
-                        any_found = True
-                        box = layout.box()
-                        row = box.row()
-                        row.label(text=node_label, icon='FILE_FOLDER')
-                        op = row.operator("rrug_ui.reset", text="", icon='LOOP_BACK')
-                        op.collection_name = node_id
-                        for k in matches: 
-                            # Clean the display name here too
-                            display_name = _PROP_ORDER_PATTERN.sub("", k)
-                            box.prop(coll, f'["{k}"]', text=display_name)
-                # Recurse through nested layouts
-                if node and node.get("ui_layout"): 
-                    scan_recursive(node["ui_layout"])
-            elif isinstance(item, list):
-                scan_recursive(item)
-    # Initiate scan from the properties root
-    scan_recursive(ui_data.get("props_others", []))
+    # Scan the properties root for matches within property keys or collection labels
+    for node_id, node in _iter_layout_nodes(nm, ui_data.get("props_others", [])):
+        coll = cached_coll((arm_key, node_id))
+        if coll is None: coll = safe_get_collection(armature, node_id)
+        if not coll: continue
+        # Refresh the entries if the collection's keys changed since the corpus was built
+        raw_keys = tuple(coll.keys())
+        cached = key_corpus.get(node_id)
+        if cached is None or cached[0] != raw_keys:
+            cached = key_corpus[node_id] = (raw_keys, _helper_prop_key_entries(raw_keys))
+        entries = cached[1]
+        memo = node_hits.get(node_id)
+        if memo is not None and memo[0] is entries: matches = memo[1]
+        else:
+            # A label match keeps every key, otherwise match against the raw or clean key
+            if query in node["label_lc"]: matches = entries
+            else: matches = tuple(e for e in entries if query in e[2])
+            node_hits[node_id] = (entries, matches)
+        if not matches: continue
+        # Draw matching properties inside a container box
+        any_found = True
+        box = layout.box()
+        row = box.row()
+        row.label(text=node["label"], icon='FILE_FOLDER')
+        op = row.operator(_OP_RESET, text="", icon='LOOP_BACK')
+        op.collection_name = node_id
+        for path, display_name, _ in matches:
+            box.prop(coll, path, text=display_name)
     if not any_found: 
         layout.label(text="No matching results found.", icon='INFO')
 
@@ -1186,48 +1579,33 @@ def draw_snap_filtered(layout, armature, ui_data, query):
     # Retrieve node map and normalize search query
     nm = ui_data.get("node_map", {})
     query = query.lower()
-    any_found = False
-    def scan_recursive(layout_list):
-        nonlocal any_found
-        for item in layout_list:
-            if isinstance(item, str):
-                node_id = item
-                node = nm.get(node_id)
-                # Focus processing on established snap groups
-                if node and node.get("is_snap_group"):
-                    label = node.get("label", node_id)
-                    parent_id = node.get("parent")
-                    parent_label = "Root"
-                    # Identify the parent collection for the folder header
-                    if parent_id and parent_id in nm:
-                        parent_label = nm[parent_id].get("label", parent_id)
-                    # Match query against group label or parent folder name
-                    if query in label.lower() or query in parent_label.lower():
-                        any_found = True
-                        box = layout.box()
-                        # Draw containing folder header
-                        head = box.row()
-                        head.label(text=parent_label, icon='FILE_FOLDER')
-                        # Draw individual snap group row and operators
-                        row = box.row(align=True)
-                        row.label(text=label, icon=node.get("icon_name") or 'GROUP_BONE')
-                        btn_row = row.row(align=True)
-                        # Add snapping operators for Loc, Rot, Scale, and All
-                        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='CON_LOCLIKE')
-                        op.parent_collection_name = node_id; op.snap_loc = True; op.snap_rot = False; op.snap_scale = False
-                        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='CON_ROTLIKE')
-                        op.parent_collection_name = node_id; op.snap_loc = False; op.snap_rot = True; op.snap_scale = False
-                        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='CON_SIZELIKE')
-                        op.parent_collection_name = node_id; op.snap_loc = False; op.snap_rot = False; op.snap_scale = True
-                        op = btn_row.operator("rrug_ui.snap_hierarchy_batch", text="", icon='SNAP_ON')
-                        op.parent_collection_name = node_id; op.snap_loc = True; op.snap_rot = True; op.snap_scale = True
-                # Continue depth-first search through children
-                if node and node.get("ui_layout"):
-                    scan_recursive(node["ui_layout"])
-            elif isinstance(item, list):
-                scan_recursive(item)
-    # Initiate scan from the snapping layout root
-    scan_recursive(ui_data.get("snap_layout", []))
+    # Reuse the matching snap groups while the query is unchanged, labels only change with the structure
+    hits = ui_data.get("_snap_hits")
+    if hits is None or hits[0] != query:
+        matched = []
+        # Scan the snapping layout root, focusing on established snap groups
+        for node_id, node in _iter_layout_nodes(nm, ui_data.get("snap_layout", [])):
+            if not node["is_snap_group"]: continue
+            parent_node = node["parent_ref"]
+            # Match query against group label or parent folder name
+            parent_label_lc = parent_node["label_lc"] if parent_node else "root"
+            if query in node["label_lc"] or query in parent_label_lc: matched.append(node_id)
+        hits = (query, tuple(matched))
+        if nm: ui_data["_snap_hits"] = hits
+    any_found = bool(hits[1])
+    for node_id in hits[1]:
+        node = nm[node_id]
+        parent_node = node["parent_ref"]
+        box = layout.box()
+        # Draw containing folder header
+        head = box.row()
+        head.label(text=parent_node["label"] if parent_node else "Root", icon='FILE_FOLDER')
+        # Draw individual snap group row and operators
+        row = box.row(align=True)
+        row.label(text=node["label"], icon=node["icon_name"] or 'GROUP_BONE')
+        btn_row = row.row(align=True)
+        # Add snapping operators for Loc, Rot, Scale, and All
+        _emit_snap_btns(btn_row, node_id)
     if not any_found:
         layout.label(text="No matching snap groups found.", icon='INFO')
 # ==============================================================================
@@ -1305,11 +1683,9 @@ class RRUG_OT_reset_pose_transforms(bpy.types.Operator):
             selected_names = [b.name for b in context.selected_pose_bones]
             bpy.ops.pose.select_all(action='SELECT')
             run_clear_cmds()
-            bpy.ops.pose.select_all(action='DESELECT')
-            for name in selected_names:
-                pb = context.object.pose.bones.get(name)
-                # FIXED: Use version-safe helper instead of direct attribute access
-                if pb: select_bone(context.object, pb.bone)
+            # Restore the cached selection with one RNA write per bone instead of another operator dispatch
+            selected_set = set(selected_names)
+            for pb in context.object.pose.bones: set_pose_bone_select(pb, pb.name in selected_set)
         return {'FINISHED'}
 
 class RRUG_OT_expand_all(bpy.types.Operator, RRUG_OperatorMixin):
@@ -1326,26 +1702,14 @@ class RRUG_OT_expand_all(bpy.types.Operator, RRUG_OperatorMixin):
         arm = context.object.data
         ui_data = update_and_get_master_tree_data(arm)
         nm = ui_data.get("node_map", {})
-        allowed_collections = set()
-        def harvest_from_layout(layout_list):
-            # Recursively collect collection names from the targeted UI branch
-            if not layout_list: return
-            for row in layout_list:
-                if isinstance(row, list):
-                    for item in row:
-                        if isinstance(item, str):
-                            allowed_collections.add(item)
-                            node = nm.get(item)
-                            if node and node.get("ui_layout"): harvest_from_layout(node["ui_layout"])
         # Select the layout branch based on the panel property
-        if self.panel == 'VIS': harvest_from_layout(ui_data.get("vis_display", []))
-        elif self.panel == 'PROPS': harvest_from_layout(ui_data.get("props_others", []))
-        elif self.panel == 'SNAP': harvest_from_layout(ui_data.get("snap_layout", []))
+        layout_key = {'VIS': "vis_display", 'PROPS': "props_others", 'SNAP': "snap_layout"}.get(self.panel)
+        # Collect collection names from the targeted UI branch with the iterative layout walk
+        allowed_collections = {node_id for node_id, _ in _iter_layout_nodes(nm, ui_data.get(layout_key, []))}
         # Apply expansion state to all harvested collections
         target_state = (self.action == 'EXPAND')
-        for coll_name in allowed_collections:
-            coll = safe_get_collection(arm, coll_name)
-            if coll: coll.is_expanded = target_state
+        for coll in resolve_collections(arm, allowed_collections).values():
+            coll.is_expanded = target_state
             
         context.view_layer.update()
         return {'FINISHED'}
@@ -1370,28 +1734,24 @@ class RRUG_OT_snap_cursor_utils(bpy.types.Operator):
     @classmethod
     def description(cls, context, properties):
         # Resolve specific descriptive text based on the active action
-        if properties.action == 'CURS_TO_SEL_LOC': return "Snap Cursor Location to Active Bone"
-        if properties.action == 'CURS_TO_SEL_ROT': return "Snap Cursor Rotation to Active Bone"
-        if properties.action == 'CURS_TO_SEL_ALL': return "Snap Cursor to Active Bone (Loc & Rot)"
-        if properties.action == 'SEL_TO_CURS_LOC': return _TIPS["SNAP_SEL_TO_CURS_LOC"][1]
-        if properties.action == 'SEL_TO_CURS_ROT': return _TIPS["SNAP_SEL_TO_CURS_ROT"][1]
-        if properties.action == 'SEL_TO_CURS_ALL': return _TIPS["SNAP_SEL_TO_CURS_ALL"][1]
+        if spec := _CURSOR_SNAP_ACTIONS.get(properties.action): return spec[2]
         return "Cursor Snap Operations"
 
     def execute(self, context):
         obj = context.active_object
         arm = obj.data
         cursor = context.scene.cursor
+        to_cursor, snap_mode, _ = _CURSOR_SNAP_ACTIONS[self.action]
         # Handle Cursor snapping to Active Bone
-        if self.action.startswith('CURS_TO_SEL'):
+        if to_cursor:
             pb = context.active_pose_bone
             if not pb:
                 self.report({'WARNING'}, "No active bone")
                 return {'CANCELLED'}
             loc, rot, _ = pb.matrix.decompose()
-            if 'LOC' in self.action or 'ALL' in self.action:
+            if snap_mode[0]:
                 cursor.location = loc
-            if 'ROT' in self.action or 'ALL' in self.action:
+            if snap_mode[1]:
                 # Apply rotation based on the cursor's current rotation mode
                 if cursor.rotation_mode == 'QUATERNION':
                     cursor.rotation_quaternion = rot
@@ -1405,16 +1765,14 @@ class RRUG_OT_snap_cursor_utils(bpy.types.Operator):
         if not bones:
             self.report({'WARNING'}, "No bones selected")
             return {'CANCELLED'}
-        # Determine transform mask
-        if 'LOC' in self.action: snap_mode = (True, False, False)
-        elif 'ROT' in self.action: snap_mode = (False, True, False)
-        else: snap_mode = (True, True, False)
-        target_matrix = cursor.matrix
+        # Decompose the cursor and read the auto-key toggle once for the whole selection
+        target_parts = cursor.matrix.decompose()
+        auto_key = arm.rrug_auto_key
         for pb in bones:
             # Decompose current matrix and recompose with cursor transforms
-            pb.matrix = get_composed_matrix(pb.matrix, target_matrix, snap_mode)
+            pb.matrix = compose_matrix_parts(pb.matrix, target_parts, snap_mode)
             # Apply keyframes if auto-keying is enabled for snapping
-            if arm.rrug_auto_key:
+            if auto_key:
                 apply_keyframes(pb, snap_mode)
         context.view_layer.update()
         return {'FINISHED'}
@@ -1449,52 +1807,57 @@ class RRUG_OT_snap_hierarchy_batch(bpy.types.Operator, RRUG_OperatorMixin):
             sc, tc = safe_get_collection(data, s), safe_get_collection(data, t)
             if sc and tc: resolved.append((sc, tc))
 
-        def apply(s_name, t_name):
-            # Apply source-to-target matrix transforms and handle keyframing
-            pb_s, pb_t = bones.get(s_name), bones.get(t_name)
-            if pb_s and pb_t:
-                pb_s.matrix = get_composed_matrix(pb_s.matrix, pb_t.matrix, mode)
-                if keys: apply_keyframes(pb_s, mode)
-                # Track bones for subsequent mirror operations if side-suffixes match
-                if mirror:
-                    if s_name.endswith(".L"): l_set.add(s_name)
-                    elif s_name.endswith(".R"): r_set.add(s_name)
-                return True
-            return False
+        # Sort bone names once to ensure consistent pairing between collections, they do not change while snapping
+        name_pairs = [tuple(zip(sorted([b.name for b in sc.bones]), sorted([b.name for b in tc.bones]))) for sc, tc in resolved]
+        # Keep only pairs with both pose bones present, the others can never update in a later pass
+        active = []
+        for chain in name_pairs:
+            for s_name, t_name in chain:
+                pb_s, pb_t = bones.get(s_name), bones.get(t_name)
+                if pb_s and pb_t: active.append((s_name, pb_s, pb_t))
+        # Track bones for subsequent mirror operations if side-suffixes match
+        if mirror:
+            for s_name, _, _ in active:
+                if s_name.endswith(".L"): l_set.add(s_name)
+                elif s_name.endswith(".R"): r_set.add(s_name)
         # Iterate through snap chains to ensure hierarchical dependencies are resolved
-        for _ in range(max(1, len(resolved))):
+        pass_count = max(1, len(resolved))
+        needs_mirror = mirror and (l_set or r_set)
+        for pass_index in range(pass_count):
             did_update = False
-            for sc, tc in resolved:
-                # Sort bones by name to ensure consistent pairing between collections
-                srcs, tgts = sorted(sc.bones, key=lambda b: b.name), sorted(tc.bones, key=lambda b: b.name)
-                for s, t in zip(srcs, tgts):
-                    if apply(s.name, t.name): did_update = True
-            # Terminate iteration if no further matrix updates are detected
+            for s_name, pb_s, pb_t in active:
+                # Apply source-to-target matrix transforms and handle keyframing
+                matrix = get_composed_matrix(pb_s.matrix, pb_t.matrix, mode)
+                # Every pair is keyed on the first pass, later passes still recompose every pair but skip the write and keyframe when settled
+                if pass_index and matrices_close(matrix, pb_s.matrix): continue
+                pb_s.matrix = matrix
+                if keys: apply_keyframes(pb_s, mode)
+                did_update = True
+            # Terminate iteration if no further matrix updates are detected, the previous pass already evaluated its writes
             if not did_update: break
+            # A following pass composes against evaluated parents, the last pass leaves evaluation to the else clause
+            if pass_index + 1 < pass_count: context.view_layer.update()
+        else:
+            # The final pass wrote matrices without evaluating, so callers and the mirror paste would read stale poses
             context.view_layer.update()
         # Execute mirror-paste logic if mirroring is enabled and bones are flagged
-        if mirror and (l_set or r_set):
+        if needs_mirror:
             win, area = get_3d_view_area(context)
             # GUARD: Ensure a valid 3D Viewport exists for the operator override
             if win and area:
                 # Use context override to execute viewport-dependent operators
                 with context.temp_override(window=win, area=area):
-                    def run_mirror(names):
-                        # Deselect all and select target source bones
-                        bpy.ops.pose.select_all(action='DESELECT')
-                        for n in names:
-                            if pb := bones.get(n): select_bone(obj, pb.bone)
+                    def run_mirror(names, opp_suffix):
+                        # Select exactly the source bones with direct RNA writes instead of a deselect operator dispatch
+                        for pb in bones: set_pose_bone_select(pb, pb.name in names)
                         restore = {}
                         # Cache transform state for opposite-side bones to prevent unwanted channel updates
+                        # Every name in a group shares one side suffix, so the opposite name is a plain slice
                         for n in names:
-                            opp = None
-                            if n.endswith(".L"): opp = n[:-2] + ".R"
-                            elif n.endswith(".R"): opp = n[:-2] + ".L"
-                            if opp and (pb := bones.get(opp)):
-                                restore[opp] = {'loc': pb.location.copy(), 'scl': pb.scale.copy()}
-                                if pb.rotation_mode == 'QUATERNION': restore[opp]['rot_q'] = pb.rotation_quaternion.copy()
-                                elif pb.rotation_mode == 'AXIS_ANGLE': restore[opp]['rot_a'] = pb.rotation_axis_angle.copy()
-                                else: restore[opp]['rot_e'] = pb.rotation_euler.copy()
+                            opp = n[:-2] + opp_suffix
+                            if pb := bones.get(opp):
+                                path, key = _ROT_PATH.get(pb.rotation_mode, _ROT_DEFAULT)
+                                restore[opp] = {'loc': pb.location.copy(), 'scl': pb.scale.copy(), key: getattr(pb, path).copy()}
                         # Use native Blender copy-paste flipped operator
                         bpy.ops.pose.copy()
                         bpy.ops.pose.paste(flipped=True)
@@ -1504,8 +1867,8 @@ class RRUG_OT_snap_hierarchy_batch(bpy.types.Operator, RRUG_OperatorMixin):
                                 restore_mirror_channels(pb, d, mode)
                                 if keys: apply_keyframes(pb, mode)
                     # Process left-to-right and right-to-left sets independently
-                    if l_set: run_mirror(l_set)
-                    if r_set: run_mirror(r_set)
+                    if l_set: run_mirror(l_set, ".R")
+                    if r_set: run_mirror(r_set, ".L")
                     context.view_layer.update()
             else:
                 # ERROR HANDLING: Notify user if context is missing
@@ -1513,6 +1876,17 @@ class RRUG_OT_snap_hierarchy_batch(bpy.types.Operator, RRUG_OperatorMixin):
                 return {'CANCELLED'}
         return {'FINISHED'}
 
+def _select_collection_subtree(ctx, collection_name, deselect_first):
+    # Select the bones of a collection and all its descendants, optionally replacing the selection
+    arm_obj = ctx.active_object
+    arm = arm_obj.data
+    if deselect_first: bpy.ops.pose.select_all(action='DESELECT')
+    nm = update_and_get_master_tree_data(arm).get("node_map", {})
+    # Target the collection and its pre-order descendants, precomputed by the scanner
+    for c in resolve_collections(arm, [collection_name, *_get_descendant_names(nm, collection_name)]).values():
+        for b in c.bones: select_bone(arm_obj, b)
+    limited_redraw()
+
 class RRUG_OT_select_replace(bpy.types.Operator, RRUG_OperatorMixin):
     bl_idname = "rrug_ui.select_replace"
     bl_label = "Replace"
@@ -1521,23 +1895,7 @@ class RRUG_OT_select_replace(bpy.types.Operator, RRUG_OperatorMixin):
     collection_name: bpy.props.StringProperty()
 
     def execute(self, ctx):
-        arm_obj = ctx.active_object
-        arm = arm_obj.data
-        bpy.ops.pose.select_all(action='DESELECT')
-        ui = update_and_get_master_tree_data(arm)
-        nm = ui.get("node_map", {})
-        targets = [self.collection_name]
-        def collect(nid):
-            node = nm.get(nid, {})
-            for c in node.get("children", []):
-                targets.append(c)
-                collect(c)
-        collect(self.collection_name)
-        for t in targets:
-            c = safe_get_collection(arm, t)
-            if c:
-                for b in c.bones: select_bone(arm_obj, b)
-        limited_redraw()
+        _select_collection_subtree(ctx, self.collection_name, True)
         return {'FINISHED'}
 
 class RRUG_OT_select_add(bpy.types.Operator, RRUG_OperatorMixin):
@@ -1548,22 +1906,7 @@ class RRUG_OT_select_add(bpy.types.Operator, RRUG_OperatorMixin):
     collection_name: bpy.props.StringProperty()
 
     def execute(self, ctx):
-        arm_obj = ctx.active_object
-        arm = arm_obj.data
-        ui = update_and_get_master_tree_data(arm)
-        nm = ui.get("node_map", {})
-        targets = [self.collection_name]
-        def collect(nid):
-            node = nm.get(nid, {})
-            for c in node.get("children", []):
-                targets.append(c)
-                collect(c)
-        collect(self.collection_name)
-        for t in targets:
-            c = safe_get_collection(arm, t)
-            if c:
-                for b in c.bones: select_bone(arm_obj, b)
-        limited_redraw()
+        _select_collection_subtree(ctx, self.collection_name, False)
         return {'FINISHED'}
 
 class RRUG_OT_vis_toggle(bpy.types.Operator, RRUG_OperatorMixin):
@@ -1590,15 +1933,14 @@ class RRUG_OT_vis_show_all(bpy.types.Operator, RRUG_OperatorMixin):
         ui_data = update_and_get_master_tree_data(arm)
         nm = ui_data.get("node_map", {})
         
-        # Iterate through all known nodes
-        for node_id, node in nm.items():
-            # Only affect collections in the DISPLAYS hierarchy
-            if node.get("tree_type") == CTX_VIS:
-                c = safe_get_collection(arm, node_id)
-                if c:
-                    c.is_visible = True
-                    
-        limited_redraw()
+        # Only affect collections in the DISPLAYS hierarchy, resolved in one pass
+        vis_ids = [node_id for node_id, node in nm.items() if node["tree_type"] == CTX_VIS]
+        # Skip collections already shown so unchanged ones do not trigger an RNA write and depsgraph tag
+        changed = False
+        for c in resolve_collections(arm, vis_ids).values():
+            if not c.is_visible: c.is_visible = True; changed = True
+        # Leave the redraw pipeline idle when everything was already shown
+        if changed: limited_redraw()
         return {'FINISHED'}
 
 class RRUG_OT_vis_unsolo_all(bpy.types.Operator, RRUG_OperatorMixin):
@@ -1610,10 +1952,12 @@ class RRUG_OT_vis_unsolo_all(bpy.types.Operator, RRUG_OperatorMixin):
     def execute(self, context):
         arm = context.object.data
         # Iterate all collections in the armature and disable solo
+        changed = False
         for coll in arm.collections_all:
             if coll.is_solo:
                 coll.is_solo = False
-        
+                changed = True
+        if not changed: return {'FINISHED'}
         # Force a refresh of the internal cache state to prevent lag
         rrug_ui_timer_update()
         limited_redraw()
@@ -1634,6 +1978,13 @@ class RRUG_OT_solo_toggle(bpy.types.Operator, RRUG_OperatorMixin):
             limited_redraw()
         return {'FINISHED'}
 
+def _sync_collection_props(src, tgt):
+    # Copy the source values of properties both collections define, keys are fetched once per side
+    shared = set(tgt.keys())
+    shared.discard("_RNA_UI")
+    for k in src.keys():
+        if k in shared: tgt[k] = src[k]
+
 class RRUG_OT_prop_symmetrize(bpy.types.Operator, RRUG_OperatorMixin):
     bl_idname = "rrug_ui.prop_symmetrize" 
     bl_label = "Symmetrize"               
@@ -1650,8 +2001,7 @@ class RRUG_OT_prop_symmetrize(bpy.types.Operator, RRUG_OperatorMixin):
         if l and r:
             # Logic remains the same (Direct Copy), but name implies symmetry now
             src, tgt = (l, r) if self.sync_left_to_right else (r, l)
-            for k in src.keys():
-                if k != "_RNA_UI" and k in tgt: tgt[k] = src[k]
+            _sync_collection_props(src, tgt)
         ctx.active_object.update_tag(); limited_redraw()
         return {'FINISHED'}
 
@@ -1665,15 +2015,14 @@ class RRUG_OT_prop_symmetrize_all(bpy.types.Operator, RRUG_OperatorMixin):
 
     def execute(self, ctx):
         arm = ctx.active_object.data
-        nm = update_and_get_master_tree_data(arm).get("node_map", {})
-        for name, node in nm.items():
-            meta = node.get("link_meta")
-            if meta and meta.get("is_source"):
-                l, r = safe_get_collection(arm, name), safe_get_collection(arm, meta.get("partner"))
-                if l and r:
-                    src, tgt = (l, r) if self.sync_left_to_right else (r, l)
-                    for k in src.keys():
-                        if k != "_RNA_UI" and k in tgt: tgt[k] = src[k]
+        # Source/partner pairs are collected once per tree build
+        links = update_and_get_master_tree_data(arm).get("link_pairs", [])
+        colls = resolve_collections(arm, [n for pair in links for n in pair])
+        for name, partner in links:
+            l, r = colls.get(name), colls.get(partner)
+            if l and r:
+                src, tgt = (l, r) if self.sync_left_to_right else (r, l)
+                _sync_collection_props(src, tgt)
         ctx.active_object.update_tag(); limited_redraw()
         return {'FINISHED'}
 
@@ -1689,29 +2038,24 @@ class RRUG_OT_reset(bpy.types.Operator, RRUG_OperatorMixin):
         # 1. Get the UI structure
         ui_data = update_and_get_master_tree_data(arm)
         nm = ui_data.get("node_map", {})
-        # 2. Collect the target and ALL its descendants
-        targets = [self.collection_name]
-        def collect_children(node_id):
-            node = nm.get(node_id)
-            if node:
-                for child_id in node.get("children", []):
-                    targets.append(child_id)
-                    collect_children(child_id)
-        # Start the recursive collection
-        collect_children(self.collection_name)
+        # 2. Collect the target and ALL its descendants, precomputed in pre-order by the scanner
+        targets = [self.collection_name, *_get_descendant_names(nm, self.collection_name)]
         # 3. Iterate through EVERY collection found and reset
         did_reset = False
+        colls = resolve_collections(arm, targets)
         for t_name in targets:
-            c = safe_get_collection(arm, t_name)
+            c = colls.get(t_name)
             if c:
+                # Bind the UI accessor once per collection, the RNA lookup is not free per key
+                prop_ui_of = c.id_properties_ui
                 for k in c.keys():
                     if k != "_RNA_UI":
                         # Safely try to get the default value
                         try:
-                            prop_ui = c.id_properties_ui(k).as_dict()
-                            default_val = prop_ui.get("default")
+                            default_val = prop_ui_of(k).as_dict().get("default")
                             if default_val is not None:
-                                c[k] = default_val
+                                # Scalars already at their default skip the write, arrays are always reassigned
+                                if isinstance(default_val, list) or c[k] != default_val: c[k] = default_val
                                 did_reset = True
                         except Exception:
                             # Skip keys that might not have UI data definition
@@ -1788,6 +2132,8 @@ class RRUG_PT_Main(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
+        # A new UI frame starts here, drop collection references from the previous one
+        _coll_cache.clear()
         # Global Gatekeeper: Only show if in Pose Mode and Rig has RRUG data
         return context.mode == 'POSE' and context.object and context.object.data.get(RRUG_TRIGGER_KEY)
 
@@ -1845,14 +2191,14 @@ class RRUG_PT_Workflow(bpy.types.Panel):
         row_sel = split_resets.row(align=True)
         row_sel.alignment = 'CENTER'
         row_sel.label(text="", icon='RESTRICT_SELECT_OFF') 
-        for t, i in [('LOC','CON_LOCLIKE'),('ROT','CON_ROTLIKE'),('SCALE','CON_SIZELIKE'),('ALL','LOOP_BACK')]:
+        for t, i in _RESET_BTNS:
             op = row_sel.operator("rrug_ui.reset_pose_transforms", text="", icon=i)
             op.subset = 'SELECTED'
             op.clear_type = t
         row_all = split_resets.row(align=True)
         row_all.alignment = 'CENTER'
         row_all.label(text="", icon='OUTLINER_OB_ARMATURE')
-        for t, i in [('LOC','CON_LOCLIKE'),('ROT','CON_ROTLIKE'),('SCALE','CON_SIZELIKE'),('ALL','LOOP_BACK')]:
+        for t, i in _RESET_BTNS:
             op = row_all.operator("rrug_ui.reset_pose_transforms", text="", icon=i)
             op.subset = 'ALL'
             op.clear_type = t
@@ -1901,16 +2247,7 @@ class RRUG_PT_Vis(bpy.types.Panel):
             draw_vis_filtered(layout, arm, ui, arm.rrug_vis_search)
         else:
             col = layout.column(align=True)
-            for g in ui.get('vis_display', []):
-                if isinstance(g, list):
-                    if len(g) == 1:
-                        draw_vis_recursive(col, arm, g[0], ui, 0)
-                    else:
-                        s = col.row(align=True).split(factor=1.0 / len(g), align=True)
-                        for k, i in enumerate(g):
-                            draw_vis_recursive(s, arm, i, ui, 0)
-                            if k < len(g) - 1:
-                                s = s.split(factor=1.0 / (len(g) - (k + 1)), align=True)
+            _draw_tree(col, ui.get("vis_display_ops", _EMPTY_TUPLE), draw_vis_node, arm, ui, "_vis_plan")
 
 class RRUG_PT_Props(bpy.types.Panel):
     bl_idname = "RRUG_PT_02_Props_New"
@@ -1950,16 +2287,7 @@ class RRUG_PT_Props(bpy.types.Panel):
                 s.operator("rrug_ui.prop_symmetrize_all", text="", icon='TRIA_LEFT').sync_left_to_right = False
                 layout.separator()
             col = layout.column(align=True)
-            for g in ui.get('props_others', []):
-                if isinstance(g, list):
-                    if len(g) == 1:
-                        draw_props_recursive(col, arm, g[0], ui)
-                    else:
-                        s = col.row(align=True).split(factor=1.0 / len(g), align=True)
-                        for k, i in enumerate(g):
-                            draw_props_recursive(s, arm, i, ui)
-                            if k < len(g) - 1:
-                                s = s.split(factor=1.0 / (len(g) - (k + 1)), align=True)
+            _draw_tree(col, ui.get("props_others_ops", _EMPTY_TUPLE), draw_props_node, arm, ui, "_props_plan")
 
 class RRUG_PT_Snap(bpy.types.Panel):
     bl_idname = "RRUG_PT_03_Snap_New"
@@ -1999,36 +2327,21 @@ class RRUG_PT_Snap(bpy.types.Panel):
             # 1. Cursor Rotation Popover
             row_utils.popover(panel="RRUG_PT_cursor_rotation_popover", text="", icon='ORIENTATION_GIMBAL')
             row_utils.separator(factor=0.5) 
-            # 2. Cursor -> Selection Group
-            grp_cur = row_utils.row(align=True)
-            grp_cur.label(text="", icon='CURSOR')
-            for a, i in [('CURS_TO_SEL_LOC','CON_LOCLIKE'),('CURS_TO_SEL_ROT','CON_ROTLIKE'),('CURS_TO_SEL_ALL','SNAP_ON')]:
-                grp_cur.operator("rrug_ui.snap_cursor_utils", text="", icon=i).action = a
-            row_utils.separator(factor=1.0)
-            # 3. Selection -> Cursor Group
-            grp_sel = row_utils.row(align=True)
-            grp_sel.label(text="", icon='SNAP_PEEL_OBJECT') 
-            for a, i in [('SEL_TO_CURS_LOC','CON_LOCLIKE'),('SEL_TO_CURS_ROT','CON_ROTLIKE'),('SEL_TO_CURS_ALL','SNAP_ON')]:
-                grp_sel.operator("rrug_ui.snap_cursor_utils", text="", icon=i).action = a
-            # 4. Spacing between Cursor Utils and Settings
-            row_utils.separator(factor=2.0)
-            # 5. Snap Settings (Auto Key and Mirror)
+            # 2. Cursor -> Selection and Selection -> Cursor Groups, the last gap separates the settings
+            for header_icon, btns, gap in _CURSOR_SNAP_GROUPS:
+                grp = row_utils.row(align=True)
+                grp.label(text="", icon=header_icon)
+                for a, i in btns:
+                    grp.operator("rrug_ui.snap_cursor_utils", text="", icon=i).action = a
+                row_utils.separator(factor=gap)
+            # 3. Snap Settings (Auto Key and Mirror)
             grp_set = row_utils.row(align=True)
             grp_set.prop(arm, "rrug_auto_key", text="", icon='RECORD_ON' if arm.rrug_auto_key else 'RECORD_OFF', toggle=True)
             grp_set.prop(arm, "rrug_snap_mirror", text="", icon='MOD_MIRROR', toggle=True)
             layout.separator()
             # --- Row 3+: Snap Groups ---
             col = layout.column(align=True)
-            for g in ui["snap_layout"]:
-                if isinstance(g, list):
-                    if len(g) == 1:
-                        draw_snap_recursive(col, arm, g[0], ui)
-                    else:
-                        s = col.row(align=True).split(factor=1.0 / len(g), align=True)
-                        for k, i in enumerate(g):
-                            draw_snap_recursive(s, arm, i, ui)
-                            if k < len(g) - 1:
-                                s = s.split(factor=1.0 / (len(g) - (k + 1)), align=True)
+            _draw_tree(col, ui.get("snap_layout_ops", _EMPTY_TUPLE), draw_snap_node, arm, ui, "_snap_plan")
 
 class RRUG_PT_cursor_rotation_popover(bpy.types.Panel):
     bl_label = "Cursor Rotation"
@@ -2042,13 +2355,8 @@ class RRUG_PT_cursor_rotation_popover(bpy.types.Panel):
         rot_mode = cursor.rotation_mode
         layout.label(text=f"Mode: {rot_mode.replace('_', ' ').title()}", icon='ORIENTATION_GIMBAL')
         layout.separator()
-        if rot_mode == 'QUATERNION':
-            data_path = "rotation_quaternion"; components = [0, 1, 2, 3]; labels = ["W", "X", "Y", "Z"]
-        elif rot_mode == 'AXIS_ANGLE':
-            data_path = "rotation_axis_angle"; components = [0, 1, 2, 3]; labels = ["W", "X", "Y", "Z"]
-        else:
-            data_path = "rotation_euler"; components = [0, 1, 2]; labels = ["X", "Y", "Z"]
-        for i, char in zip(components, labels):
+        data_path, axes = _CURSOR_ROT_LAYOUT.get(rot_mode, _CURSOR_ROT_DEFAULT)
+        for i, char in axes:
             row = layout.row(align=True)
             row.prop(cursor, data_path, index=i, text=char)
             op = row.operator("rrug_ui.zero_cursor_axis", text="", icon='LOOP_BACK')
@@ -2084,6 +2392,7 @@ _CLASSES = (
     RRUG_PT_Props,
     RRUG_PT_Snap
 )
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(_CLASSES)
 
 def register():
     # Properties
@@ -2108,33 +2417,47 @@ def register():
         name="Mirror Snap", description="Mirror the snap action to the opposite side", default=False
     )
     # Classes
-    for c in _CLASSES:
-        bpy.utils.register_class(c)
+    _register_classes()
     # App State
     if not bpy.app.timers.is_registered(rrug_ui_timer_update):
         bpy.app.timers.register(rrug_ui_timer_update, first_interval=0.25, persistent=True)
     if rrug_ui_load_handler not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(rrug_ui_load_handler)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if rrug_ui_undo_handler not in handlers: handlers.append(rrug_ui_undo_handler)
+    if rrug_ui_depsgraph_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(rrug_ui_depsgraph_handler)
 
 def unregister():
     purge_rrug_cache()
     if bpy.app.timers.is_registered(rrug_ui_timer_update):
         bpy.app.timers.unregister(rrug_ui_timer_update)
+    if bpy.app.timers.is_registered(_flush_redraw):
+        bpy.app.timers.unregister(_flush_redraw)
     load_post = bpy.app.handlers.load_post
     to_remove = [h for h in load_post if h.__name__ == "rrug_ui_load_handler"]
     for h in to_remove: load_post.remove(h)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        to_remove = [h for h in handlers if h.__name__ == "rrug_ui_undo_handler"]
+        for h in to_remove: handlers.remove(h)
+    depsgraph_post = bpy.app.handlers.depsgraph_update_post
+    to_remove = [h for h in depsgraph_post if h.__name__ == "rrug_ui_depsgraph_handler"]
+    for h in to_remove: depsgraph_post.remove(h)
     # Cleanup Properties
     props = ["rrug_auto_key", "rrug_snap_mirror", "rrug_vis_search", 
              "rrug_prop_search", "rrug_snap_search", "rrug_vis_is_filtered"]
     for p in props:
-        if hasattr(bpy.types.Armature, p): delattr(bpy.types.Armature, p)
-    for c in reversed(_CLASSES):
-        bpy.utils.unregister_class(c)
+        try: delattr(bpy.types.Armature, p)
+        except AttributeError: pass
+    _unregister_classes()
 
 if __name__ == "__main__":
     import addon_utils
     is_global_active = False
-    for mod in addon_utils.modules():
+    # Reuse Blender's cached add-on list instead of rescanning disk, only enabled add-ons can be active
+    enabled_addons = set(bpy.context.preferences.addons.keys())
+    for mod in addon_utils.modules(refresh=False):
+        if mod.__name__ not in enabled_addons: continue
         if hasattr(mod, "bl_info") and mod.bl_info.get("name") == "RRUG UI":
             try:
                 if addon_utils.check(mod.__name__)[1]: